@@ -0,0 +1,611 @@
+"""
+fake_webdriver.py
+
+In-memory stand-in for a Selenium WebDriver, for profiling harness overhead and
+exercising error paths without launching a browser.
+
+FakeDriver implements the subset of the WebDriver API search_trending_edge uses
+(get, find_element(s), execute_script, execute_async_script, execute_cdp_cmd,
+back, title, current_url, window calls, and W3C actions from ActionChains)
+against a scripted model of the Bing homepage, results, images/news and
+destination pages. Every call goes through FakeDriver.execute, like a real
+driver, so instrumentation and command counting work unchanged.
+
+Latency and failures can be injected:
+  driver = FakeDriver(latency=0.05)                      # 50ms per command
+  driver.fail_after(10, "invalid session id")            # 11th command on fails
+  driver.fail_after(0, "no such window", commands={'get'})
+
+Get one from the engine with build_browser_driver('fake'); the
+SEARCH_AUTOMATION_FAKE_LATENCY environment variable sets its latency.
+
+Usage:
+  python fake_webdriver.py --profile                  # profile 30 searches, waits skipped
+  python fake_webdriver.py --profile --searches 10 --latency-ms 5
+  python fake_webdriver.py --backend-bench --sessions 16   # thread vs asyncio backend
+"""
+
+import sys
+import time
+import itertools
+import urllib.parse
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webelement import WebElement
+
+# Key used by W3C actions to reference an element as a pointer origin
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class FakeElement(WebElement):
+    """An element of a FakePage; its calls go through the driver's execute"""
+
+    def __init__(self, parent, id_, tag, attrs=None, text="", role=None):
+        super().__init__(parent, id_)
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self._text = text
+        self.role = role
+        self.value = self.attrs.get('value', "")
+
+    @property
+    def text(self):
+        return self._parent.execute('getElementText', {'id': self._id})['value']
+
+    @property
+    def tag_name(self):
+        return self.tag
+
+    def click(self):
+        self._parent.execute('clickElement', {'id': self._id})
+
+    def send_keys(self, *value):
+        self._parent.execute('sendKeysToElement', {'id': self._id, 'text': "".join(value)})
+
+    def clear(self):
+        self._parent.execute('clearElement', {'id': self._id})
+
+    def get_attribute(self, name):
+        return self._parent.execute('getElementAttribute', {'id': self._id, 'name': name})['value']
+
+    def is_displayed(self):
+        return True
+
+    @property
+    def location(self):
+        return {'x': 100, 'y': 100 + int(self._id.rsplit('-', 1)[-1]) * 10}
+
+    @property
+    def size(self):
+        return {'width': 200, 'height': 24}
+
+
+class FakePage:
+    """Scripted model of one page: its kind, elements and scroll state"""
+
+    def __init__(self, driver, url):
+        self.url = url
+        parts = urllib.parse.urlsplit(url)
+        self.base = f"{parts.scheme}://{parts.netloc}"
+        self.query = urllib.parse.parse_qs(parts.query).get('q', [''])[0]
+        self.scroll_y = 0
+        self.scroll_height = 3000
+        self.marked = False  # set by NAVIGATION_MARK_SCRIPT; a new page starts unmarked
+        self.elements = []
+        self._driver = driver
+
+        if parts.path in ('', '/'):
+            self.kind = 'homepage'
+            self.title = "Bing"
+            self.add('input', {'name': 'q'}, role='search_box')
+            self.add('button', text="Accept", role='consent')
+            self.add('button', text="Reject", role='consent')
+            for name in ('hp_sw_logo', 'hp_sw', 'b_searchbox'):
+                self.add('div', {'class': name}, role='homepage')
+            self.add('a', {'href': f"{self.base}/news/search?q=today"}, "Trending now", role='news_tab')
+        elif parts.path == '/search':
+            self.kind = 'results'
+            self.title = f"{self.query} - Search"
+            quoted = urllib.parse.quote_plus(self.query)
+            self.add('input', {'name': 'q', 'value': self.query}, role='search_box')
+            self.add('a', {'href': f"{self.base}/search?q={quoted}"}, "All", role='web_tab')
+            self.add('a', {'href': f"{self.base}/images/search?q={quoted}"}, "Images", role='images_tab')
+            self.add('a', {'href': f"{self.base}/news/search?q={quoted}"}, "News", role='news_tab')
+            for i in range(1, 9):
+                self.add('a', {'href': f"{self.base}/page/{i}?q={quoted}"}, f"Result {i}", role='result')
+            for word in ('news', 'today', 'guide'):
+                self.add('li', {'class': 'b_rs'}, f"{self.query} {word}", role='related')
+        elif parts.path in ('/images/search', '/news/search'):
+            self.kind = parts.path.split('/')[1]
+            self.title = f"{self.query} - {self.kind}"
+            quoted = urllib.parse.quote_plus(self.query)
+            self.add('a', {'href': f"{self.base}/search?q={quoted}"}, "All", role='web_tab')
+        else:
+            self.kind = 'destination'
+            self.title = "Destination"
+            self.scroll_height = 6000
+
+        if self.kind != 'destination':
+            self.add('a', {'class': 'id_button', 'href': f"{self.base}/profile"}, "Account", role='account')
+            self.add('span', {'class': 'rewardsbadge'}, "Rewards", role='rewards')
+
+    def add(self, tag, attrs=None, text="", role=None):
+        element = FakeElement(self._driver, f"fake-{next(self._driver._element_ids)}", tag, attrs, text, role)
+        self._driver._elements[element.id] = element
+        self.elements.append(element)
+        return element
+
+    def by_role(self, role):
+        return [e for e in self.elements if e.role == role]
+
+    def first(self, role):
+        found = self.by_role(role)
+        return found[0] if found else None
+
+    def snapshot(self):
+        """The structure PAGE_SNAPSHOT_SCRIPT returns, built from the model"""
+        return {
+            'url': self.url,
+            'ready_state': 'complete',
+            'search_box': self.first('search_box'),
+            'results': [{'element': e, 'href': e.attrs['href']} for e in self.by_role('result')],
+            'images_tab': self.first('images_tab'),
+            'news_tab': self.first('news_tab'),
+            'web_tab': self.first('web_tab'),
+            'consent_buttons': [{'element': e, 'text': e._text} for e in self.by_role('consent')][:12],
+            'related_searches': self.by_role('related')[:3],
+            'account_indicators': self.by_role('account')[:5],
+            'rewards_elements': self.by_role('rewards')[:5],
+            'homepage_elements': self.by_role('homepage')[:3],
+        }
+
+
+class FakeDriver:
+    """
+    WebDriver stand-in backed by FakePage models. `latency` seconds are added
+    to every command; see fail_after for failure injection.
+    """
+
+    def __init__(self, latency=0.0, base_url=None):
+        import search_trending_edge
+
+        self._engine = search_trending_edge
+        self.latency = latency
+        self.base_url = base_url or search_trending_edge.BING_URL
+        self.session_id = "fake-session"
+        self.commands_executed = 0
+        self._element_ids = itertools.count()
+        self._elements = {}
+        self._history = []
+        self._page = None
+        self._focused = None
+        self._select_all = False
+        self._quit = False
+        self._failure = None  # (remaining commands before failing, message, command names or None)
+
+    # -- failure and latency injection -------------------------------------
+
+    def fail_after(self, commands, message="invalid session id", only=None):
+        """
+        Makes every command fail with WebDriverException(message) once
+        `commands` more commands have succeeded. With `only` (a set of
+        command names, e.g. {'get'}), just those commands fail and only they
+        count down.
+        """
+        self._failure = [commands, message, set(only) if only else None]
+
+    def _check_failure(self, driver_command):
+        if self._quit and driver_command != 'quit':
+            raise WebDriverException("invalid session id")
+        if self._failure is None:
+            return
+        remaining, message, only = self._failure
+        if only is not None and driver_command not in only:
+            return
+        if remaining <= 0:
+            raise WebDriverException(message)
+        self._failure[0] -= 1
+
+    # -- command dispatch ---------------------------------------------------
+
+    def execute(self, driver_command, params=None):
+        """Runs one command against the page model, like a remote round trip"""
+        if self.latency:
+            time.sleep(self.latency)
+        self.commands_executed += 1
+        self._check_failure(driver_command)
+        handler = getattr(self, f"_cmd_{driver_command}", None)
+        if handler is None:
+            return {'value': None}
+        return {'value': handler(params or {})}
+
+    def _cmd_get(self, params):
+        if self._page is not None:
+            self._history.append(self._page.url)
+        self._navigate(params['url'])
+
+    def _cmd_goBack(self, params):
+        if self._history:
+            self._navigate(self._history.pop())
+
+    def _cmd_getTitle(self, params):
+        return self._page.title if self._page else ""
+
+    def _cmd_getCurrentUrl(self, params):
+        return self._page.url if self._page else "about:blank"
+
+    def _cmd_quit(self, params):
+        self._quit = True
+
+    def _cmd_findElement(self, params):
+        found = self._find(params['using'], params['value'])
+        if not found:
+            raise NoSuchElementException(f"no such element: {params['using']}={params['value']}")
+        return found[0]
+
+    def _cmd_findElements(self, params):
+        return self._find(params['using'], params['value'])
+
+    def _cmd_executeScript(self, params):
+        return self._run_script(params['script'], params.get('args', []))
+
+    def _cmd_executeAsyncScript(self, params):
+        script, args = params['script'], params.get('args', [])
+        if script == self._engine.SCROLL_PLAN_SCRIPT:
+            pause = 0.0
+            for op, amount, pause_ms in args[0]:
+                self._scroll(op, amount)
+                pause += pause_ms / 1000.0
+            self._engine.CLOCK.sleep(pause)  # the browser would pause this long in-page
+            return self._page.scroll_y
+        return None
+
+    def _cmd_executeCdpCommand(self, params):
+        return {}
+
+    def _cmd_getElementText(self, params):
+        return self._elements[params['id']]._text
+
+    def _cmd_getElementAttribute(self, params):
+        element = self._elements[params['id']]
+        if params['name'] == 'value':
+            return element.value
+        return element.attrs.get(params['name'])
+
+    def _cmd_clickElement(self, params):
+        self._click(self._elements[params['id']])
+
+    def _cmd_clearElement(self, params):
+        self._elements[params['id']].value = ""
+
+    def _cmd_sendKeysToElement(self, params):
+        self._focused = self._elements[params['id']]
+        for key in params['text']:
+            self._type_key(key)
+
+    def _cmd_actions(self, params):
+        # W3C actions run tick by tick: tick i is every device's i-th action,
+        # and lasts as long as the longest pause/move in it
+        sources = params.get('actions', [])
+        pressed = set()
+        pointer_target = None
+        total_pause = 0.0
+        for tick in itertools.zip_longest(*[source.get('actions', []) for source in sources]):
+            tick_duration = 0
+            for action in tick:
+                if not action:
+                    continue
+                kind = action.get('type')
+                tick_duration = max(tick_duration, action.get('duration', 0) or 0)
+                if kind == 'keyDown':
+                    key = action['value']
+                    pressed.add(key)
+                    if Keys.CONTROL in pressed and key.lower() == 'a':
+                        self._select_all = True
+                    elif key not in (Keys.CONTROL, Keys.SHIFT, Keys.ALT):
+                        self._type_key(key)
+                elif kind == 'keyUp':
+                    pressed.discard(action['value'])
+                elif kind == 'pointerMove':
+                    origin = action.get('origin')
+                    if isinstance(origin, dict) and ELEMENT_KEY in origin:
+                        pointer_target = self._elements.get(origin[ELEMENT_KEY])
+                elif kind == 'pointerUp' and pointer_target is not None:
+                    self._click(pointer_target)
+            total_pause += tick_duration / 1000.0
+        self._engine.CLOCK.sleep(total_pause)  # scaled like any intentional wait
+
+    def _cmd_getWindowRect(self, params):
+        return {'x': 0, 'y': 0, 'width': 1366, 'height': 900}
+
+    # -- WebDriver API used by the engine ------------------------------------
+
+    def get(self, url):
+        self.execute('get', {'url': url})
+
+    def back(self):
+        self.execute('goBack')
+
+    def quit(self):
+        self.execute('quit')
+
+    @property
+    def title(self):
+        return self.execute('getTitle')['value']
+
+    @property
+    def current_url(self):
+        return self.execute('getCurrentUrl')['value']
+
+    def find_element(self, by='id', value=None):
+        return self.execute('findElement', {'using': by, 'value': value})['value']
+
+    def find_elements(self, by='id', value=None):
+        return self.execute('findElements', {'using': by, 'value': value})['value']
+
+    def execute_script(self, script, *args):
+        return self.execute('executeScript', {'script': script, 'args': list(args)})['value']
+
+    def execute_async_script(self, script, *args):
+        return self.execute('executeAsyncScript', {'script': script, 'args': list(args)})['value']
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+    def get_window_size(self, windowHandle='current'):
+        rect = self.execute('getWindowRect')['value']
+        return {'width': rect['width'], 'height': rect['height']}
+
+    def set_window_position(self, x, y, windowHandle='current'):
+        self.execute('setWindowRect', {'x': x, 'y': y})
+
+    def set_window_size(self, width, height, windowHandle='current'):
+        self.execute('setWindowRect', {'width': width, 'height': height})
+
+    def set_script_timeout(self, time_to_wait):
+        self.execute('setTimeouts', {'script': int(time_to_wait * 1000)})
+
+    # -- page model --------------------------------------------------------
+
+    def _navigate(self, url):
+        if not urllib.parse.urlsplit(url).scheme:
+            base = self._page.base if self._page else self.base_url
+            url = urllib.parse.urljoin(base + "/", url)
+        self._page = FakePage(self, url)
+        self._focused = None
+        self._select_all = False
+
+    def _find(self, by, value):
+        if self._page is None:
+            return []
+        if by == 'name':
+            return [e for e in self._page.elements if e.attrs.get('name') == value]
+        if by == 'tag name':
+            return [e for e in self._page.elements if e.tag == value]
+        if by == 'css selector' and value.startswith('.'):
+            return [e for e in self._page.elements if value[1:] in e.attrs.get('class', '').split()]
+        return []
+
+    def _run_script(self, script, args):
+        engine = self._engine
+        if script == engine.PAGE_SNAPSHOT_SCRIPT:
+            return self._page.snapshot()
+        if script == engine.NAVIGATION_MARK_SCRIPT:
+            self._page.marked = True
+            return None
+        if script == engine.READY_CONDITIONS['new_results']:
+            return self._page is not None and not self._page.marked
+        if script in engine.READY_CONDITIONS.values():
+            return self._page is not None
+        if 'scrollHeight' in script and script.strip().startswith('return'):
+            return self._page.scroll_height
+        if 'scrollBy' in script:
+            amount = script.split('scrollBy(0,', 1)[1].split(')', 1)[0].strip()
+            try:
+                self._scroll('by', int(amount))
+            except ValueError:
+                pass
+        return None
+
+    def _scroll(self, op, amount):
+        page = self._page
+        if op == 'to':
+            page.scroll_y = amount
+        elif op == 'by':
+            page.scroll_y += amount
+        elif op == 'viewport':
+            page.scroll_y += int(900 * amount)
+        elif op == 'fraction':
+            page.scroll_y = int(page.scroll_height * amount)
+        page.scroll_y = max(0, min(page.scroll_y, page.scroll_height))
+
+    def _click(self, element):
+        if element.tag == 'a' and element.attrs.get('href'):
+            self._history.append(self._page.url)
+            self._navigate(element.attrs['href'])
+        elif element.tag == 'button' and element.role == 'consent':
+            self._page.elements = [e for e in self._page.elements if e.role != 'consent']
+        elif element.tag == 'input':
+            self._focused = element
+
+    def _type_key(self, key):
+        element = self._focused
+        if element is None:
+            return
+        if key in (Keys.ENTER, Keys.RETURN):
+            if element.role == 'search_box':
+                self._history.append(self._page.url)
+                self._navigate(f"{self._page.base}/search?q={urllib.parse.quote_plus(element.value)}")
+            return
+        if key == Keys.BACKSPACE:
+            element.value = "" if self._select_all else element.value[:-1]
+        elif len(key) == 1 and key >= ' ':
+            element.value = key if self._select_all else element.value + key
+        self._select_all = False
+
+
+def profile_harness(searches=30, latency_ms=0):
+    """
+    Profiles run_search_sequence on a FakeDriver with all intentional waits
+    skipped: Python CPU per function and peak allocation.
+    """
+    import cProfile
+    import pstats
+    import random
+    import tracemalloc
+
+    import search_trending_edge
+
+    random.seed(0)
+    search_trending_edge.CLOCK.set_compression('zero')
+    topics = search_trending_edge.generate_dynamic_topics(searches)
+    driver = FakeDriver(latency=latency_ms / 1000.0)
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    started = time.perf_counter()
+    profiler.enable()
+    results = search_trending_edge.run_search_sequence(topics, browser='fake', min_wait=0, max_wait=0, driver=driver,
+                                                       checkpoint=False)
+    profiler.disable()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    completed = sum(1 for r in results if r['outcome'] in ('success', 'direct_url'))
+    print(f"\nHarness profile: {completed}/{len(results)} searches, {driver.commands_executed} driver commands, "
+          f"{elapsed:.3f}s wall, peak allocation {peak / 1024:.0f} KiB")
+    stats = pstats.Stats(profiler)
+    for name in ('run_search_sequence', 'perform_rewards_qualifying_actions', 'click_search_result'):
+        for (filename, _, function), (_, calls, _, cumulative, _) in stats.stats.items():
+            if function == name and filename.endswith('search_trending_edge.py'):
+                print(f"  {name:<36} calls {calls:4d}  cumulative {cumulative * 1000:8.1f} ms")
+    stats.sort_stats('cumulative').print_stats(15)
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if it cannot be read"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def backend_run(backend, sessions, searches, latency_ms, wait, compression):
+    """
+    Runs `sessions` fake sessions at once on one backend ('thread' or 'async')
+    and returns wall and CPU time, peak thread count and RSS, and how late the
+    intentional waits woke up (the scheduling delay).
+    """
+    import os
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import search_trending_edge
+
+    search_trending_edge.CLOCK.set_compression(compression)
+    search_trending_edge.CLOCK.reset_lateness()
+    jobs = [(search_trending_edge.generate_dynamic_topics(searches), FakeDriver(latency=latency_ms / 1000.0))
+            for _ in range(sessions)]
+    options = dict(browser='fake', min_wait=wait, max_wait=wait, checkpoint=False)
+
+    peak_threads = [threading.active_count()]
+    sampling = threading.Event()
+
+    def sample_threads():
+        while not sampling.wait(0.01):
+            peak_threads[0] = max(peak_threads[0], threading.active_count() - 1)  # less this sampler
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+
+    cpu_started = sum(os.times()[:2])
+    started = time.perf_counter()
+    if backend == 'async':
+        async def run_all():
+            with ThreadPoolExecutor(max_workers=search_trending_edge.ASYNC_WORKERS) as executor:
+                return await asyncio.gather(*(
+                    search_trending_edge.run_search_sequence_async(topics, driver=driver, executor=executor, **options)
+                    for topics, driver in jobs))
+        results = asyncio.run(run_all())
+    else:
+        results = [None] * sessions
+
+        def run_one(i):
+            topics, driver = jobs[i]
+            results[i] = search_trending_edge.run_search_sequence(topics, driver=driver, **options)
+        threads = [threading.Thread(target=run_one, args=(i,)) for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    wall = time.perf_counter() - started
+    sampling.set()
+
+    clock = search_trending_edge.CLOCK
+    return {
+        'backend': backend,
+        'searches': sum(len(r) for r in results),
+        'wall': wall,
+        'cpu': sum(os.times()[:2]) - cpu_started,
+        'peak_threads': peak_threads[0],
+        'peak_rss_mb': _peak_rss_mb(),
+        'waits': clock.waits,
+        'mean_lateness_ms': clock.lateness / clock.waits * 1000 if clock.waits else 0.0,
+    }
+
+
+def backend_bench(sessions=16, searches=3, latency_ms=20, wait=10, compression=20):
+    """
+    Compares the thread and asyncio backends on the same fake workload. Each
+    backend runs in a fresh interpreter so peak memory is its own.
+    """
+    import json
+    import subprocess
+
+    print(f"Backend benchmark: {sessions} fake sessions x {searches} searches, {latency_ms:g} ms per command, "
+          f"{wait:g}s waits at {compression:g}x")
+    print(f"  {'backend':<8} {'wall':>8} {'cpu':>8} {'threads':>8} {'peak rss':>9} {'waits':>6} {'late/wait':>10}")
+    for backend in ('thread', 'async'):
+        proc = subprocess.run([sys.executable, __file__, '--backend-run', backend, '--sessions', str(sessions),
+                               '--searches', str(searches), '--latency-ms', str(latency_ms), '--wait', str(wait),
+                               '--compression', str(compression)], capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+            print(f"  {backend:<8} failed ({error})")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        rss = f"{r['peak_rss_mb']:.1f} MB" if r['peak_rss_mb'] is not None else "-"
+        print(f"  {backend:<8} {r['wall']:7.2f}s {r['cpu']:7.2f}s {r['peak_threads']:8d} {rss:>9} "
+              f"{r['waits']:6d} {r['mean_lateness_ms']:8.2f}ms")
+
+
+if __name__ == "__main__":
+    def option(name, default):
+        return type(default)(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    import search_trending_edge
+
+    search_trending_edge.configure_logging(option('--log-level', 'WARNING'))
+    if "--profile" in sys.argv:
+        profile_harness(option('--searches', 30), option('--latency-ms', 0.0))
+    elif "--backend-bench" in sys.argv:
+        backend_bench(option('--sessions', 16), option('--searches', 3), option('--latency-ms', 20.0),
+                      option('--wait', 10.0), option('--compression', 20.0))
+    elif "--backend-run" in sys.argv:
+        import json
+
+        result = backend_run(option('--backend-run', 'thread'), option('--sessions', 16), option('--searches', 3),
+                             option('--latency-ms', 20.0), option('--wait', 10.0), option('--compression', 20.0))
+        search_trending_edge.flush_logs()
+        print(json.dumps(result))
+    else:
+        print(__doc__)
@@ -0,0 +1,334 @@
+"""
+offline_bench.py
+
+End-to-end benchmark of run_search_sequence against a local stand-in for Bing.
+
+The stand-in server reproduces the DOM contracts search_trending_edge relies on:
+- homepage and results pages with a search box (name="q"),
+- organic results as .b_algo h2 a inside #b_results,
+- images/news tab links and a web-results link back,
+- related searches (.b_rs), consent buttons and account elements (.id_button),
+with configurable artificial latency per request. Pages also pull in images,
+a web font and a video so lean mode (see LEAN_BROWSERS) has something to save.
+
+Each browser builder is run headless against it; the benchmark reports launch
+time, per-search latency, WebDriver round-trip counts, bytes served and browser
+memory, and saves the results under bench_results/ tagged with the current
+commit so runs can be compared.
+
+Usage:
+  python offline_bench.py                        # all browsers, 3 searches each
+  python offline_bench.py chrome firefox         # only these browsers
+  python offline_bench.py --searches 5 --latency-ms 150
+  python offline_bench.py --compression 100      # keep waits, 100x faster (default: zero)
+  python offline_bench.py --lean                 # run every browser in lean mode
+  python offline_bench.py --lean-compare         # run each browser normal then lean; report savings
+  python offline_bench.py --serve                # just run the stand-in server
+  python offline_bench.py --compare              # also diff against the previous saved run
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import html
+import subprocess
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import search_trending_edge
+from search_trending_edge import build_browser_driver, run_search_sequence, generate_dynamic_topics
+from run_all_browsers_parallel import percentile
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+DEFAULT_BROWSERS = ['edge', 'chrome', 'firefox', 'brave']
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>@font-face {{ font-family: standin; src: url(/assets/standin.woff2); }}
+body {{ font-family: standin, sans-serif; min-height: 3000px; }} .b_algo {{ margin: 24px 0; }}</style>
+</head><body>
+<header>
+  <a class="id_button" aria-label="Account manager" href="/profile">Account</a>
+  <span class="rewardsbadge">Rewards</span>
+</header>
+{body}
+</body></html>
+"""
+
+HOMEPAGE_BODY = """
+<div id="consent"><button onclick="this.parentNode.remove()">Accept</button><button>Reject</button></div>
+<div class="hp_sw">
+  <div class="hp_sw_logo"><img src="/assets/background.jpg" alt="">Stand-in search</div>
+  <form action="/search" method="get" class="b_searchbox"><input name="q" type="search" autocomplete="off"></form>
+</div>
+<div class="trending"><a href="/news/search?q=today">Trending now</a></div>
+<div class="hp_bottom">Stand-in homepage</div>
+"""
+
+
+# Static assets: (content type, size in bytes)
+ASSETS = {
+    'background.jpg': ("image/jpeg", 250 * 1024),
+    'thumb.jpg': ("image/jpeg", 25 * 1024),
+    'standin.woff2': ("font/woff2", 60 * 1024),
+    'clip.mp4': ("video/mp4", 1024 * 1024),
+}
+
+class StandInSearchHandler(BaseHTTPRequestHandler):
+    """Serves the stand-in homepage, results, vertical and destination pages"""
+
+    latency = 0.0  # seconds added to every response
+    jitter = 0.0   # extra random seconds, 0..jitter
+    served = None  # {'bytes', 'requests'}, shared by the server's handlers
+    served_lock = threading.Lock()
+
+    def do_GET(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query).get('q', [''])[0]
+        if url.path.startswith('/assets/'):
+            name = url.path.split('/')[-1].split('-')[-1]
+            if name in ASSETS:
+                content_type, size = ASSETS[name]
+                return self.send_body(b"\0" * size, content_type)
+            self.send_error(404)
+            return
+        if url.path == '/':
+            page = PAGE_TEMPLATE.format(title="Stand-in search", body=HOMEPAGE_BODY)
+        elif url.path == '/search':
+            page = PAGE_TEMPLATE.format(title=f"{html.escape(query)} - Search", body=self.results_body(query))
+        elif url.path in ('/images/search', '/news/search'):
+            vertical = url.path.split('/')[1]
+            back = f"/search?q={urllib.parse.quote_plus(query)}"
+            page = PAGE_TEMPLATE.format(
+                title=f"{html.escape(query)} - {vertical}",
+                body=f'<h1>{vertical.title()} for {html.escape(query)}</h1><a href="{back}">All</a>')
+        elif url.path.startswith('/page/'):
+            paragraphs = "".join(f"<p>Paragraph {i} of a destination page.</p>" for i in range(60))
+            media = ('<img src="/assets/background.jpg" alt="">'
+                     '<video src="/assets/clip.mp4" preload="auto" muted autoplay></video>')
+            page = PAGE_TEMPLATE.format(title="Destination", body=f"<h1>Destination</h1>{media}{paragraphs}")
+        else:
+            page = PAGE_TEMPLATE.format(title="Stand-in", body="<p>Nothing here.</p>")
+
+        self.send_body(page.encode("utf-8"), "text/html; charset=utf-8")
+
+    def send_body(self, data, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+        if self.served is not None:
+            with self.served_lock:
+                self.served['bytes'] += len(data)
+                self.served['requests'] += 1
+
+    def results_body(self, query):
+        quoted = urllib.parse.quote_plus(query)
+        host = f"http://{self.headers.get('Host', '127.0.0.1')}"
+        results = "".join(
+            f'<li class="b_algo"><img src="/assets/{i}-thumb.jpg" alt="">'
+            f'<h2><a href="{host}/page/{i}?q={quoted}">Result {i} for {html.escape(query)}</a></h2>'
+            f'<p>Snippet for result {i}.</p></li>'
+            for i in range(1, 11)
+        )
+        related = "".join(
+            f'<li><a href="/search?q={quoted}+{word}">{html.escape(query)} {word}</a></li>'
+            for word in ('news', 'today', 'guide')
+        )
+        return f"""
+<form action="/search" method="get" class="b_searchbox"><input name="q" type="search" value="{html.escape(query)}"></form>
+<nav>
+  <a href="/search?q={quoted}">All</a>
+  <a href="/images/search?q={quoted}">Images</a>
+  <a href="/news/search?q={quoted}">News</a>
+</nav>
+<ol id="b_results">{results}</ol>
+<div class="b_rs"><h2>Related searches</h2><ul>{related}</ul></div>
+"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(port=0, latency_ms=0, jitter_ms=0):
+    """Start the stand-in server on a background thread; returns (server, base_url)"""
+    handler = type("ConfiguredStandInHandler", (StandInSearchHandler,), {
+        'latency': latency_ms / 1000.0,
+        'jitter': jitter_ms / 1000.0,
+        'served': {'bytes': 0, 'requests': 0},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="StandIn-Server", daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def browser_memory_mb(driver):
+    """Resident memory of the driver's browser process tree in MB (needs psutil), else None"""
+    try:
+        import psutil
+        root = psutil.Process(driver.service.process.pid)
+        return sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def bench_browser(browser, searches, base_url, served, lean=False):
+    """Launch one browser headless, run `searches` searches, return its stats"""
+    search_trending_edge.BING_URL = base_url
+    started = time.time()
+    driver = build_browser_driver(browser=browser, headless=True, instrument=True, lean=lean)
+    launch_time = time.time() - started
+    recorder = driver._recorder
+    served_before = dict(served)
+    try:
+        results = run_search_sequence(generate_dynamic_topics(searches), browser=browser,
+                                      min_wait=0, max_wait=0, driver=driver, checkpoint=False)
+        memory = browser_memory_mb(driver)
+    finally:
+        driver.quit()
+        recorder.close()
+        search_trending_edge._instrumentation.recorder = None
+
+    latencies = [r['ended'] - r['started'] for r in results if r['outcome'] in ('success', 'direct_url')]
+    phases = {phase: dict(totals) for phase, totals in recorder.totals.items()}
+    search_commands = sum(t['commands'] for phase, t in phases.items() if phase != 'launch')
+    return {
+        'lean': lean,
+        'launch_time': launch_time,
+        'searches': len(results),
+        'completed': len(latencies),
+        'latency_p50': percentile(latencies, 50),
+        'latency_max': max(latencies) if latencies else None,
+        'commands_total': sum(t['commands'] for t in phases.values()),
+        'commands_per_search': search_commands / len(results) if results else None,
+        'command_time_total': sum(t['command_time'] - t['page_pause_time'] for t in phases.values()),
+        'bytes_served': served['bytes'] - served_before['bytes'],
+        'requests_served': served['requests'] - served_before['requests'],
+        'memory_mb': memory,
+        'phases': phases,
+        'trace': recorder.path,
+    }
+
+
+def save_results(run):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{run['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+def previous_results(exclude_path):
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    paths = sorted(os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR) if name.endswith(".json"))
+    paths = [p for p in paths if os.path.abspath(p) != os.path.abspath(exclude_path)]
+    if not paths:
+        return None
+    with open(paths[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(run, baseline=None):
+    def fmt(value, unit='s'):
+        return f"{value:.2f}{unit}" if value is not None else "-"
+
+    print(f"\nOffline benchmark @ {run['commit']} (latency {run['config']['latency_ms']}ms, "
+          f"{run['config']['searches']} searches per browser, clock {run['config']['compression']})")
+    print(f"  {'browser':<13} {'launch':>8} {'p50':>8} {'max':>8} {'cmds/search':>12} {'cmd time':>9} "
+          f"{'served':>9} {'memory':>9}")
+    for browser, stats in run['browsers'].items():
+        if 'error' in stats:
+            print(f"  {browser:<13} failed: {stats['error']}")
+            continue
+        print(f"  {browser:<13} {fmt(stats['launch_time']):>8} {fmt(stats['latency_p50']):>8} "
+              f"{fmt(stats['latency_max']):>8} {fmt(stats['commands_per_search'], ''):>12} "
+              f"{fmt(stats['command_time_total']):>9} {fmt(stats['bytes_served'] / 1024 / 1024, 'MB'):>9} "
+              f"{fmt(stats['memory_mb'], 'MB'):>9}")
+        normal = run['browsers'].get(browser[:-len(" (lean)")]) if browser.endswith(" (lean)") else None
+        if normal and 'error' not in normal:
+            def saved(key, scale=1):
+                if normal.get(key) is None or stats.get(key) is None:
+                    return None
+                return (normal[key] - stats[key]) / scale
+
+            print(f"  {'':<13} lean saved {fmt(saved('bytes_served', 1024 * 1024), 'MB')} transferred, "
+                  f"{fmt(saved('memory_mb'), 'MB')} memory, {fmt(saved('latency_p50'))} p50 latency")
+        old = (baseline or {}).get('browsers', {}).get(browser)
+        if old and 'error' not in old:
+            deltas = []
+            for key, label in (('launch_time', 'launch'), ('latency_p50', 'p50'),
+                               ('commands_per_search', 'cmds/search')):
+                if stats[key] is not None and old.get(key) is not None:
+                    deltas.append(f"{label} {stats[key] - old[key]:+.2f}")
+            print(f"  {'':<13} vs {baseline['commit']}: {', '.join(deltas)}")
+
+
+def main(argv):
+    search_trending_edge.configure_logging()
+    browsers = [arg for arg in argv if arg in DEFAULT_BROWSERS] or DEFAULT_BROWSERS
+    searches = int(argv[argv.index('--searches') + 1]) if '--searches' in argv else 3
+    latency_ms = int(argv[argv.index('--latency-ms') + 1]) if '--latency-ms' in argv else 0
+    jitter_ms = int(argv[argv.index('--jitter-ms') + 1]) if '--jitter-ms' in argv else 0
+    port = int(argv[argv.index('--port') + 1]) if '--port' in argv else 0
+    compression = argv[argv.index('--compression') + 1] if '--compression' in argv else 'zero'
+    lean_modes = [False, True] if '--lean-compare' in argv else ['--lean' in argv]
+    # Intentional waits are skipped by default so timings show harness and browser cost
+    search_trending_edge.CLOCK.set_compression(compression)
+
+    server, base_url = start_stand_in_server(port, latency_ms, jitter_ms)
+    print(f"Stand-in search server at {base_url}")
+    if '--serve' in argv:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return
+
+    run = {
+        'commit': current_commit(),
+        'timestamp': time.time(),
+        'config': {'searches': searches, 'latency_ms': latency_ms, 'jitter_ms': jitter_ms,
+                   'compression': str(search_trending_edge.CLOCK), 'lean': lean_modes},
+        'browsers': {},
+    }
+    try:
+        for browser in browsers:
+            for lean in lean_modes:
+                name = f"{browser} (lean)" if lean else browser
+                search_trending_edge.flush_logs()
+                print(f"\n=== {name.upper()} ===")
+                try:
+                    run['browsers'][name] = bench_browser(browser, searches, base_url, server.RequestHandlerClass.served, lean)
+                except Exception as e:
+                    print(f"{name.upper()} benchmark failed: {e}")
+                    run['browsers'][name] = {'error': str(e)}
+    finally:
+        server.shutdown()
+
+    path = save_results(run)
+    search_trending_edge.flush_logs()
+    print_results(run, previous_results(path) if '--compare' in argv else None)
+    print(f"\nSaved: {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
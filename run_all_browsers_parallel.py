@@ -1,53 +1,381 @@
 """
 Run 30 searches across all 4 browsers (Edge, Chrome, Firefox, Brave) IN PARALLEL
+
+Usage:
+  python run_all_browsers_parallel.py                  # one thread per browser
+  python run_all_browsers_parallel.py --backend async  # all browsers on one event loop
+  python run_all_browsers_parallel.py --log-level DEBUG --log-json  # every step, as JSON lines
+  python run_all_browsers_parallel.py --metrics-port 9464  # Prometheus metrics while it runs
 """
 
 import sys
 import os
 import time
+import json
 import threading
+import importlib.util
+from collections import deque
+from concurrent.futures import Future
 sys.path.append(r'C:\Users\himan\Desktop\edge search')
 
-from search_trending_edge import run_search_sequence, generate_dynamic_topics, fetch_trending_queries
-import random
+from search_trending_edge import (run_search_sequence, run_search_sequence_async, topic_pipeline, take_topics, TopicQueue,
+                                  CACHE_DIR, ASYNC_WORKERS, METRICS, METRICS_PORT, start_metrics_server, log,
+                                  log_context, configure_logging, flush_logs)
+from session_daemon import run_search_sequence_via_daemon
 
 # Thread-safe results tracking
 results_lock = threading.Lock()
 browser_results = {}
 
-def run_browser_searches(browser, topics, browser_num):
-    """Run searches on a single browser (called in separate thread)"""
-    TOPIC_COUNT = 30
+# Run reports (JSON) are written here
+REPORT_DIR = os.path.join(CACHE_DIR, "reports")
+
+# Session admission: at most MAX_SESSIONS browsers run at once (0 = all), and
+# a new one starts only while free memory and load per CPU allow it
+HAVE_PSUTIL = importlib.util.find_spec("psutil") is not None
+MAX_SESSIONS = int(os.environ.get("SEARCH_AUTOMATION_MAX_SESSIONS", "0"))
+MIN_FREE_MEMORY_MB = int(os.environ.get("SEARCH_AUTOMATION_MIN_FREE_MB", "1024"))
+SESSION_MEMORY_MB = int(os.environ.get("SEARCH_AUTOMATION_SESSION_MB", "500"))
+MAX_LOAD_PER_CPU = float(os.environ.get("SEARCH_AUTOMATION_MAX_LOAD", "1.5"))
+
+# Browsers pull topics from one shared queue. A quota caps one browser's share
+# (e.g. {'edge': 30}); SEARCH_AUTOMATION_BROWSER_QUOTA sets it for all others.
+BROWSER_QUOTAS = {}
+BROWSER_QUOTA = int(os.environ["SEARCH_AUTOMATION_BROWSER_QUOTA"]) if os.environ.get("SEARCH_AUTOMATION_BROWSER_QUOTA") else None
+QUEUE_CHECKPOINT = "parallel-queue"
+
+# Execution backend: 'thread' (one thread per browser) or 'async' (one event
+# loop; see run_search_sequence_async). SESSION_TIMEOUT (seconds, 0 = none)
+# stops an async session that runs longer.
+BACKEND = os.environ.get("SEARCH_AUTOMATION_BACKEND", "thread")
+SESSION_TIMEOUT = float(os.environ.get("SEARCH_AUTOMATION_SESSION_TIMEOUT", "0"))
+
+def free_memory_mb():
+    """Available physical memory in MB, or None if it cannot be measured"""
+    if HAVE_PSUTIL:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys / (1024 * 1024)
+    return None
+
+def load_per_cpu():
+    """1-minute load average divided by CPU count, or None if unavailable"""
+    try:
+        if HAVE_PSUTIL:
+            import psutil
+            load = psutil.getloadavg()[0]
+        else:
+            load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+    return load / (os.cpu_count() or 1)
+
+class SessionScheduler:
+    """
+    Admits browser sessions in request order. A session starts when fewer than
+    max_sessions are running and the host has capacity: free memory, less the
+    expected footprint of sessions still starting up, stays above
+    min_free_mb and load per CPU is at most max_load. Resources are re-measured
+    every poll_interval seconds while sessions are queued.
+    """
+
+    def __init__(self, max_sessions, min_free_mb=MIN_FREE_MEMORY_MB, max_load=MAX_LOAD_PER_CPU,
+                 session_mb=SESSION_MEMORY_MB, warmup=20.0, poll_interval=2.0):
+        self.max_sessions = max_sessions
+        self.min_free_mb = min_free_mb
+        self.max_load = max_load
+        self.session_mb = session_mb
+        self.warmup = warmup
+        self.poll_interval = poll_interval
+        self.running = {}  # name -> admitted at
+        self.queue = deque()
+        self.condition = threading.Condition()
+    
+    def blocked_by(self):
+        """Why the next session cannot start yet, or None if it can"""
+        if not self.running:
+            return None  # always let one session run, however busy the host
+        if len(self.running) >= self.max_sessions:
+            return f"{len(self.running)}/{self.max_sessions} sessions running"
+        free = free_memory_mb()
+        if free is not None:
+            starting = sum(1 for t in self.running.values() if time.time() - t < self.warmup)
+            if free - starting * self.session_mb < self.min_free_mb:
+                return f"{free:.0f} MB free"
+        load = load_per_cpu()
+        if load is not None and load > self.max_load:
+            return f"load {load:.2f} per CPU"
+        return None
+    
+    def _try_start(self, name):
+        """Starts `name` if it is next and may run (call with the condition held); else returns why not"""
+        reason = self.blocked_by() if self.queue[0] == name else "waiting for earlier sessions"
+        if reason is None:
+            self.queue.popleft()
+            self.running[name] = time.time()
+            self.condition.notify_all()
+        return reason
+    
+    def admit(self, name):
+        """Blocks until `name` may start; returns the seconds it was queued"""
+        queued_at = time.time()
+        reported = None
+        with self.condition:
+            self.queue.append(name)
+            while True:
+                reason = self._try_start(name)
+                if reason is None:
+                    break
+                if reason != reported:
+                    log.info(f"⏸️  Queued: {reason}")
+                    reported = reason
+                self.condition.wait(self.poll_interval)
+        return time.time() - queued_at
+    
+    async def admit_async(self, name, check_interval=0.5):
+        """admit() for the asyncio backend: re-checks every check_interval instead of blocking"""
+        import asyncio
+
+        queued_at = time.time()
+        reported = None
+        with self.condition:
+            self.queue.append(name)
+        try:
+            while True:
+                with self.condition:
+                    reason = self._try_start(name)
+                if reason is None:
+                    return time.time() - queued_at
+                if reason != reported:
+                    log.info(f"⏸️  Queued: {reason}")
+                    reported = reason
+                await asyncio.sleep(check_interval)
+        except asyncio.CancelledError:
+            with self.condition:
+                if name in self.queue:
+                    self.queue.remove(name)  # let the sessions behind it through
+                    self.condition.notify_all()
+            raise
+    
+    def release(self, name):
+        with self.condition:
+            self.running.pop(name, None)
+            self.condition.notify_all()
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(n * pct / 100)
+    return ordered[int(rank) - 1]
+
+def build_run_report(browsers, results):
+    """Combine per-search results into per-browser latency/throughput stats"""
+    report = {'generated_at': time.time(), 'browsers': {}}
+    for browser in browsers:
+        result = results.get(browser, {'status': 'unknown'})
+        searches = result.get('searches', [])
+        latencies = [s['ended'] - s['started'] for s in searches if s['outcome'] == 'success']
+        to_results = [s['time_to_results'] for s in searches if s['time_to_results'] is not None]
+        completed = sum(1 for s in searches if s['outcome'] in ('success', 'direct_url'))
+        failures = {}
+        for s in searches:
+            if s['error_type']:
+                failures[s['error_type']] = failures.get(s['error_type'], 0) + 1
+        if result['status'] == 'failed':
+            failures[result.get('error_type', 'Exception')] = failures.get(result.get('error_type', 'Exception'), 0) + 1
+        
+        # Throughput over the session's whole span, waits between searches included
+        span = (searches[-1]['ended'] - searches[0]['started']) if searches else 0
+        report['browsers'][browser] = {
+            'status': result['status'],
+            'queue_wait': result.get('queue_wait'),
+            'attempted': len(searches),
+            'completed': completed,
+            'failed': len(searches) - completed,
+            'latency_p50': percentile(latencies, 50),
+            'latency_p95': percentile(latencies, 95),
+            'latency_max': max(latencies) if latencies else None,
+            'time_to_results_p50': percentile(to_results, 50),
+            'engagement_time_total': sum(s['engagement_time'] or 0 for s in searches),
+            'searches_per_hour': completed / span * 3600 if span > 0 else None,
+            'failures_by_type': failures,
+            'searches': searches,
+        }
+    return report
+
+def print_run_report(report):
+    """Print the per-browser latency table from build_run_report"""
+    def fmt(value, unit='s'):
+        return f"{value:.1f}{unit}" if value is not None else "-"
+    
+    print(f"{'Browser':<9} {'queued':>7} {'done':>5} {'fail':>5} {'p50':>7} {'p95':>7} {'max':>7} {'to-res':>7} {'/hour':>7}")
+    for browser, stats in report['browsers'].items():
+        print(f"{browser.upper():<9} {fmt(stats['queue_wait']):>7} {stats['completed']:>5} {stats['failed']:>5} "
+              f"{fmt(stats['latency_p50']):>7} {fmt(stats['latency_p95']):>7} {fmt(stats['latency_max']):>7} "
+              f"{fmt(stats['time_to_results_p50']):>7} {fmt(stats['searches_per_hour'], ''):>7}")
+        for error_type, count in sorted(stats['failures_by_type'].items()):
+            print(f"{'':<9} {count} x {error_type}")
+
+def write_run_report(report):
+    """Write the report as JSON and return its path"""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"run-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def run_browser_searches(browser, topics, browser_num, scheduler):
+    """Run searches on a single browser once the scheduler admits it (called in separate thread)"""
+    MIN_WAIT = 10
+    MAX_WAIT = 10
+    
+    log_context(browser=browser, session=None, search=None)
+    METRICS.set_phase(browser, 'queued')
+    queue_wait = scheduler.admit(browser)
+    if queue_wait >= 1:
+        log.info(f"▶️  Admitted after {queue_wait:.1f}s in queue")
+    try:
+        log.info(f"🚀 Starting searches from the shared topic queue...")
+        
+        # Use the warm session if session_daemon.py is running, else launch here
+        searches = run_search_sequence_via_daemon(topics, browser, MIN_WAIT, MAX_WAIT)
+        if searches is None:
+            searches = run_search_sequence(
+                topics,
+                browser=browser,
+                headless=False,
+                min_wait=MIN_WAIT,
+                max_wait=MAX_WAIT,
+                use_existing=False
+            )
+        
+        completed = sum(1 for s in searches if s['outcome'] in ('success', 'direct_url'))
+        with results_lock:
+            browser_results[browser] = {'status': 'success', 'count': completed, 'searches': searches,
+                                        'queue_wait': queue_wait}
+        
+        log.info(f"✅ Completed {completed} searches!")
+        
+    except Exception as e:
+        log.error(f"❌ Error: {e}")
+        with results_lock:
+            browser_results[browser] = {'status': 'failed', 'error': str(e), 'error_type': type(e).__name__,
+                                        'queue_wait': queue_wait}
+    finally:
+        scheduler.release(browser)
+
+async def run_browser_searches_async(browser, topics, browser_num, scheduler, executor):
+    """run_browser_searches for the asyncio backend: one task per browser, all on one event loop"""
+    import asyncio
+
     MIN_WAIT = 10
     MAX_WAIT = 10
     
+    log_context(browser=browser, session=None, search=None)  # each task has its own context
+    METRICS.set_phase(browser, 'queued')
+    queue_wait = await scheduler.admit_async(browser)
+    if queue_wait >= 1:
+        log.info(f"▶️  Admitted after {queue_wait:.1f}s in queue")
     try:
-        print(f"\n🚀 [{browser.upper()}] Starting {TOPIC_COUNT} searches...")
+        log.info(f"🚀 Starting searches from the shared topic queue (async)...")
         
-        run_search_sequence(
-            topics,
-            browser=browser,
-            headless=False,
-            min_wait=MIN_WAIT,
-            max_wait=MAX_WAIT,
-            use_existing=False
-        )
+        # A daemon job is one blocking request; it holds a pool thread until it returns
+        loop = asyncio.get_running_loop()
+        searches = await loop.run_in_executor(executor, run_search_sequence_via_daemon,
+                                              topics, browser, MIN_WAIT, MAX_WAIT)
+        if searches is None:
+            session = run_search_sequence_async(topics, browser=browser, headless=False, min_wait=MIN_WAIT,
+                                                max_wait=MAX_WAIT, use_existing=False, executor=executor)
+            searches = await asyncio.wait_for(session, SESSION_TIMEOUT or None)
         
+        completed = sum(1 for s in searches if s['outcome'] in ('success', 'direct_url'))
         with results_lock:
-            browser_results[browser] = {'status': 'success', 'count': len(topics)}
+            browser_results[browser] = {'status': 'success', 'count': completed, 'searches': searches,
+                                        'queue_wait': queue_wait}
         
-        print(f"\n✅ [{browser.upper()}] Completed {TOPIC_COUNT} searches!")
+        log.info(f"✅ Completed {completed} searches!")
         
     except Exception as e:
-        print(f"\n❌ [{browser.upper()}] Error: {e}")
+        if isinstance(e, asyncio.TimeoutError):
+            e = TimeoutError(f"session stopped after the {SESSION_TIMEOUT:g}s session timeout")
+        log.error(f"❌ Error: {e}")
         with results_lock:
-            browser_results[browser] = {'status': 'failed', 'error': str(e)}
+            browser_results[browser] = {'status': 'failed', 'error': str(e), 'error_type': type(e).__name__,
+                                        'queue_wait': queue_wait}
+    finally:
+        scheduler.release(browser)
+
+async def run_browsers_async(browsers, topics, scheduler):
+    """Runs every browser session as a task on one event loop, sharing ASYNC_WORKERS threads"""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix="Search-Step") as executor:
+        await asyncio.gather(*(run_browser_searches_async(browser, topics, i, scheduler, executor)
+                               for i, browser in enumerate(browsers, 1)))
+
+def prepare_topic_queue(browsers, topic_count):
+    """Draw topics from the shared pipeline into the queue the browsers share"""
+    # Generate enough topics for all browsers
+    log.info("📝 Generating search topics...")
+    total_needed = topic_count * len(browsers)
+    unique_searches = take_topics(topic_pipeline(trend_limit=300, region='global'), total_needed)
+    if len(unique_searches) < total_needed:
+        log.warning(f"⚠️  Only {len(unique_searches)} unique topics available (need {total_needed})")
+    log.info(f"✅ Generated {len(unique_searches)} unique topics (need {total_needed})")
+    
+    preview = "".join(f"\n  {idx}. {topic}" for idx, topic in enumerate(unique_searches[:3], 1))
+    log.info(f"📋 Topic queue:{preview}\n  ... and {len(unique_searches) - 3} more")
+    
+    return TopicQueue(unique_searches, BROWSER_QUOTAS, BROWSER_QUOTA, checkpoint_name=QUEUE_CHECKPOINT)
+
+def source_topic_queue(browsers, topic_count, topic_future, run_start):
+    """Resolve the shared topic queue future (runs alongside browser launch)"""
+    try:
+        queue = TopicQueue.resume(QUEUE_CHECKPOINT, BROWSER_QUOTAS, BROWSER_QUOTA)
+        if queue is not None:
+            log.info(f"📝 Resuming {len(queue)} unfinished topics from the previous run")
+        else:
+            queue = prepare_topic_queue(browsers, topic_count)
+    except Exception as e:
+        log.error(f"❌ Topic sourcing failed: {e}")
+        topic_future.set_exception(e)
+        return
+    
+    log.info(f"📝 Topics ready after {time.time() - run_start:.1f}s")
+    topic_future.set_result(queue)
 
-def run_all_browsers_parallel():
-    """Run 30 searches on each of the 4 browsers simultaneously"""
+def run_all_browsers_parallel(backend=BACKEND, metrics_port=METRICS_PORT):
+    """
+    Run 30 searches on each of the 4 browsers simultaneously ('thread' or
+    'async' backend), serving live metrics on localhost if metrics_port is set
+    """
     
     browsers = ['edge', 'chrome', 'firefox', 'brave']
     TOPIC_COUNT = 30
+    scheduler = SessionScheduler(MAX_SESSIONS or len(browsers))
     
     # H1M Watermark
     print("\n" + "=" * 70)
@@ -64,101 +392,66 @@ def run_all_browsers_parallel():
     print("=" * 70)
     print(f"Configuration:")
     print(f"  - Browsers: Edge, Chrome, Firefox, Brave")
-    print(f"  - Searches per browser: {TOPIC_COUNT}")
+    print(f"  - Searches per browser: {TOPIC_COUNT} on average (shared queue)")
     print(f"  - Total searches: {TOPIC_COUNT * len(browsers)}")
-    print(f"  - Execution: PARALLEL (all browsers at once)")
+    print(f"  - Execution: PARALLEL, {backend} backend (up to {scheduler.max_sessions} at once, "
+          f"while >{scheduler.min_free_mb} MB free and load <{scheduler.max_load}/CPU)")
     print("=" * 70)
     print()
     
-    # Generate enough topics for all browsers
-    print("📝 Generating search topics...")
-    queries = fetch_trending_queries(limit=300, region='global')
+    metrics_server = None
+    if metrics_port:
+        try:
+            metrics_server = start_metrics_server(metrics_port)
+            log.info(f"📈 Live metrics at http://127.0.0.1:{metrics_port}/metrics")
+        except OSError as e:
+            log.warning(f"Could not start the metrics endpoint on port {metrics_port}: {e}")
     
-    if not queries:
-        print("Couldn't fetch live trending queries; generating dynamic topics...")
-        queries = generate_dynamic_topics(TOPIC_COUNT * len(browsers) * 3)  # Generate 3x more to ensure enough
-    else:
-        print(f"Using {len(queries)} trending queries from pytrends...")
-        dynamic_topics = generate_dynamic_topics(TOPIC_COUNT * len(browsers) * 2)  # Generate 2x more
-        queries.extend(dynamic_topics)
-    
-    # Remove duplicates
-    unique_queries = []
-    seen = set()
-    for query in queries:
-        query_lower = query.lower()
-        if query_lower not in seen:
-            unique_queries.append(query)
-            seen.add(query_lower)
-    
-    queries = unique_queries
-    
-    # Ensure we have enough topics
-    total_needed = TOPIC_COUNT * len(browsers)
-    if len(queries) < total_needed:
-        print(f"⚠️  Need {total_needed} topics but only have {len(queries)}, generating more...")
-        additional = generate_dynamic_topics(total_needed - len(queries) + 20)
-        for query in additional:
-            query_lower = query.lower()
-            if query_lower not in seen:
-                queries.append(query)
-                seen.add(query_lower)
-    
-    print(f"✅ Generated {len(queries)} unique topics (need {total_needed})\n")
-    
-    # Prepare topics for each browser
-    browser_topics = {}
-    for i, browser in enumerate(browsers):
-        start_idx = i * TOPIC_COUNT
-        topics = queries[start_idx:start_idx + TOPIC_COUNT]
-        
-        # Add variations to some topics
-        unique_searches = []
-        for topic in topics:
-            if random.random() < 0.3:  # 30% chance of variation
-                variations = [
-                    f"{topic} 2025",
-                    f"{topic} news",
-                    f"{topic} today",
-                    f"{topic} latest",
-                    f"best {topic}",
-                    f"{topic} guide",
-                    f"{topic} tips"
-                ]
-                topic = random.choice(variations)
-            unique_searches.append(topic)
-        
-        browser_topics[browser] = unique_searches
-        
-        print(f"📋 Topics for {browser.upper()}:")
-        for idx, topic in enumerate(unique_searches[:3], 1):
-            print(f"  {idx}. {topic}")
-        print(f"  ... and {len(unique_searches) - 3} more\n")
+    # Source topics in the background while the browsers launch; each
+    # browser only waits for the queue once it is ready to search
+    run_start = time.time()
+    topic_future = Future()
+    topic_thread = threading.Thread(
+        target=source_topic_queue,
+        args=(browsers, TOPIC_COUNT, topic_future, run_start),
+        name="Topics-Thread"
+    )
+    topic_thread.start()
     
     # Create threads for each browser
     threads = []
     print("=" * 70)
-    print("🔥 LAUNCHING ALL BROWSERS IN PARALLEL...")
+    print("🔥 LAUNCHING BROWSERS IN PARALLEL AS CAPACITY ALLOWS...")
     print("=" * 70)
     print()
     
-    for i, browser in enumerate(browsers, 1):
-        thread = threading.Thread(
-            target=run_browser_searches,
-            args=(browser, browser_topics[browser], i),
-            name=f"{browser.upper()}-Thread"
-        )
-        threads.append(thread)
-        thread.start()
-        time.sleep(2)  # Small delay to avoid simultaneous browser launches
-    
-    # Wait for all threads to complete
-    print(f"\n⏳ Waiting for all {len(browsers)} browsers to complete...\n")
+    if backend == 'async':
+        import asyncio
+
+        log.info(f"⏳ Running all {len(browsers)} browsers on one event loop ({ASYNC_WORKERS} worker threads)...")
+        asyncio.run(run_browsers_async(browsers, topic_future.result, scheduler))
+    else:
+        for i, browser in enumerate(browsers, 1):
+            thread = threading.Thread(
+                target=run_browser_searches,
+                args=(browser, topic_future.result, i, scheduler),
+                name=f"{browser.upper()}-Thread"
+            )
+            threads.append(thread)
+            thread.start()
+        
+        # Wait for all threads to complete
+        log.info(f"⏳ Waiting for all {len(browsers)} browsers to complete...")
+        
+        for thread in threads:
+            thread.join()
+    topic_thread.join()
     
-    for thread in threads:
-        thread.join()
+    if metrics_server is not None:
+        metrics_server.shutdown()
     
     # Display results
+    flush_logs()
     print("\n" + "=" * 70)
     print("🎉 ALL BROWSERS COMPLETED!")
     print("=" * 70)
@@ -181,12 +474,24 @@ def run_all_browsers_parallel():
     print(f"📊 Summary:")
     print(f"   Successful: {successful}/{len(browsers)} browsers")
     print(f"   Failed: {failed}/{len(browsers)} browsers")
-    print(f"   Total searches: {successful * TOPIC_COUNT}")
+    print(f"   Total searches: {sum(r.get('count', 0) for r in browser_results.values())}")
+    print("=" * 70)
+    
+    report = build_run_report(browsers, browser_results)
+    print_run_report(report)
+    print(f"📄 Run report: {write_run_report(report)}")
     print("=" * 70)
 
 if __name__ == "__main__":
+    configure_logging(sys.argv[sys.argv.index("--log-level") + 1] if "--log-level" in sys.argv else None,
+                      'json' if "--log-json" in sys.argv else None)
+    backend = sys.argv[sys.argv.index("--backend") + 1] if "--backend" in sys.argv else BACKEND
+    if backend not in ('thread', 'async'):
+        print(f"Unknown backend {backend!r}; use 'thread' or 'async'")
+        sys.exit(2)
+    metrics_port = int(sys.argv[sys.argv.index("--metrics-port") + 1]) if "--metrics-port" in sys.argv else METRICS_PORT
     try:
-        run_all_browsers_parallel()
+        run_all_browsers_parallel(backend, metrics_port)
     except KeyboardInterrupt:
         print("\n\n⚠️  Automation stopped by user (Ctrl+C)")
         sys.exit(0)
@@ -12,62 +12,289 @@ Usage:
   python search_trending_edge.py chrome        # Search in Chrome (Bing)
   python search_trending_edge.py brave         # Search in Brave (Bing)
   python search_trending_edge.py firefox       # Search in Firefox (Bing)
+  python search_trending_edge.py --startup-bench  # Report cold import time per component
+  python search_trending_edge.py --pipeline-bench # Time each topic pipeline stage
+  python search_trending_edge.py chrome --typing-bench  # Compare per-key vs batched typing
+  python search_trending_edge.py chrome --typing-bench --headed  # ...with the browser visible
 
 Requirements:
   pip install selenium webdriver-manager pytrends
   Microsoft Edge, Chrome, Brave, or Firefox browser installed on the machine.
 """
 
+import os
+import json
 import time
 import random
+import logging
+import itertools
+import threading
+import contextvars
 import urllib.parse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-# Edge-specific imports
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-
-# Chrome-specific imports
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Firefox-specific imports
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.firefox import GeckoDriverManager
-
-# Optional: pytrends to fetch trending searches
-try:
-    from pytrends.request import TrendReq
-    HAVE_PYTRENDS = True
-except Exception:
-    HAVE_PYTRENDS = False
-
-def fetch_trending_queries(limit=100, region='global'):
-    """
-    Tries to fetch trending search queries via pytrends.
-    If pytrends is not available or fetching fails, returns None.
-    """
-    if not HAVE_PYTRENDS:
-        return None
+import importlib.util
+
+# Browser backends (selenium + webdriver_manager) and pytrends are imported
+# lazily inside the functions that need them, so importing this module - or
+# running a single browser - does not pay for every stack up front.
+HAVE_PYTRENDS = importlib.util.find_spec("pytrends") is not None
+
+# Local state (driver cache, etc.) lives here so it survives between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".search_automation")
+
+# Search site to drive; overridable so runs can target a local stand-in
+BING_URL = os.environ.get("SEARCH_AUTOMATION_BASE_URL", "https://www.bing.com").rstrip("/")
+
+# Logging: every module logs to `log`. configure_logging() sends records
+# through a queue to one writer thread, so sessions never block on stdout, and
+# stamps each with the browser, session and search index of the code that
+# logged it (see log_context). Per-step detail is DEBUG; INFO and up by default.
+LOG_LEVEL = os.environ.get("SEARCH_AUTOMATION_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("SEARCH_AUTOMATION_LOG_FORMAT", "text")  # 'text' or 'json'
+
+log = logging.getLogger("search_automation")
+_log_context = contextvars.ContextVar("search_automation_log_context", default={})
+_log_queue = None
+_log_listener = None
+
+def log_context(**fields):
+    """
+    Sets browser=, session= and/or search= on records logged from the current
+    thread or asyncio task (each starts with its own context).
+    """
+    context = dict(_log_context.get())
+    context.update(fields)
+    _log_context.set(context)
+
+class _LogContextFilter(logging.Filter):
+    # Runs on the logging thread, before the record is queued
+    def filter(self, record):
+        context = _log_context.get()
+        record.browser = context.get('browser')
+        record.session = context.get('session')
+        record.search = context.get('search')
+        return True
+
+class TextLogFormatter(logging.Formatter):
+    """'12:00:01 [EDGE #3] message'; warnings and errors are marked"""
+
+    def format(self, record):
+        tag = ""
+        if record.browser:
+            tag = f"[{record.browser.upper()}" + (f" #{record.search}" if record.search else "") + "] "
+        level = f"{record.levelname}: " if record.levelno >= logging.WARNING else ""
+        line = f"{self.formatTime(record, '%H:%M:%S')} {tag}{level}{record.getMessage()}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {'ts': round(record.created, 3), 'level': record.levelname, 'browser': record.browser,
+                 'session': record.session, 'search': record.search, 'message': record.getMessage()}
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """
+    Starts the queue-backed log writer (idempotent; call again to change the
+    level or format). Defaults come from SEARCH_AUTOMATION_LOG_LEVEL and
+    SEARCH_AUTOMATION_LOG_FORMAT; output goes to stdout.
+    """
+    global _log_queue, _log_listener
+    import sys
+    import queue
+    import atexit
+    import logging.handlers
+
+    level = (level or LOG_LEVEL).upper()
+    fmt = fmt or LOG_FORMAT
+    if fmt not in ('text', 'json'):
+        raise ValueError(f"log format must be 'text' or 'json', not {fmt!r}")
+    if _log_listener is not None:
+        _log_listener.stop()
+        log.handlers.clear()
+    else:
+        atexit.register(lambda: _log_listener and _log_listener.stop())
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JsonLogFormatter() if fmt == 'json' else TextLogFormatter())
+    _log_queue = queue.Queue()
+    handler = logging.handlers.QueueHandler(_log_queue)
+    handler.addFilter(_LogContextFilter())
+    log.addHandler(handler)
+    log.setLevel(level)
+    log.propagate = False
+    _log_listener = logging.handlers.QueueListener(_log_queue, writer)
+    _log_listener.start()
+
+_session_numbers = itertools.count(1)
+
+def _new_session_id(browser):
+    """Names one browser session (a launch or relaunch) in log records"""
+    return f"{browser}-{os.getpid()}-{next(_session_numbers)}"
+
+def flush_logs():
+    """Waits until every queued record has been written"""
+    if _log_queue is not None:
+        _log_queue.join()
+
+# Components reported by --startup-bench, each imported in a fresh interpreter
+STARTUP_COMPONENTS = [
+    ("selenium core", "from selenium import webdriver"),
+    ("edge backend", "from selenium.webdriver.edge.service import Service; from selenium.webdriver.edge.options import Options"),
+    ("chrome backend", "from selenium.webdriver.chrome.service import Service; from selenium.webdriver.chrome.options import Options"),
+    ("firefox backend", "from selenium.webdriver.firefox.service import Service; from selenium.webdriver.firefox.options import Options"),
+    ("webdriver_manager edge", "from webdriver_manager.microsoft import EdgeChromiumDriverManager"),
+    ("webdriver_manager chrome", "from webdriver_manager.chrome import ChromeDriverManager"),
+    ("webdriver_manager firefox", "from webdriver_manager.firefox import GeckoDriverManager"),
+    ("pytrends", "from pytrends.request import TrendReq"),
+    ("search_trending_edge", "import search_trending_edge"),
+    ("search_trending_edge + SAMPLE_TOPICS", "import search_trending_edge; search_trending_edge.SAMPLE_TOPICS"),
+]
+
+# Trending queries are cached per region and served immediately; once older
+# than the TTL they are still served while a background refresh runs
+TRENDS_CACHE_FILE = os.path.join(CACHE_DIR, "trends_cache.json")
+TRENDS_CACHE_TTL = float(os.environ.get("SEARCH_AUTOMATION_TRENDS_TTL", 6 * 3600))
+
+# Optional stand-in for the trends endpoint (JSON of {region: [queries]}, the
+# same shape as Google's hottrends data); when set, pytrends is not used
+TRENDS_ENDPOINT = os.environ.get("SEARCH_AUTOMATION_TRENDS_URL")
+
+_trends_refreshing = set()
+_trends_refreshing_lock = threading.Lock()
+
+def _trends_region(region):
+    region = (region or 'global').lower()
+    return 'global' if region in ['global', 'world', 'globe'] else region
+
+class _CacheFileLock:
+    """
+    Cross-process lock built on an exclusively created lock file, so several
+    runner processes can share one cache file. Locks older than `stale_after`
+    seconds are assumed to belong to a crashed process and are broken.
+    """
+
+    def __init__(self, path, timeout=10.0, stale_after=60.0):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.time() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def _load_trends_cache():
+    try:
+        with open(TRENDS_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _store_trends_cache_entry(region, queries):
+    """
+    Merges one region's queries into the shared cache file under the
+    cross-process lock and replaces the file atomically.
+    """
+    with _CacheFileLock(TRENDS_CACHE_FILE + ".lock"):
+        cache = _load_trends_cache()
+        cache[region] = {'fetched_at': time.time(), 'queries': queries}
+        tmp_path = f"{TRENDS_CACHE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, TRENDS_CACHE_FILE)
+
+def _download_trending_queries(region):
+    """
+    Fetches the full trending list for a region from TRENDS_ENDPOINT if set,
+    otherwise via pytrends. Returns None on any failure.
+    """
     try:
-        pytrends = TrendReq(hl='en-US', tz=360)
-        if region.lower() in ['global', 'world', 'globe']:
-            df = pytrends.trending_searches(pn='global')
+        if TRENDS_ENDPOINT:
+            import urllib.request
+            with urllib.request.urlopen(TRENDS_ENDPOINT, timeout=15) as response:
+                data = json.loads(response.read().decode("utf-8"))
+            queries = [str(x) for x in data.get(region, [])]
         else:
+            if not HAVE_PYTRENDS:
+                return None
+            from pytrends.request import TrendReq
+            pytrends = TrendReq(hl='en-US', tz=360)
             df = pytrends.trending_searches(pn=region)
-        queries = [str(x) for x in df[0].tolist()]
-        return queries[:limit]
+            queries = [str(x) for x in df[0].tolist()]
+        return queries or None
     except Exception:
         return None
 
+def _refresh_trending_queries(region):
+    """
+    Downloads and caches one region's queries. Only one refresh per region
+    runs at a time in this process; the file lock covers other processes.
+    """
+    try:
+        queries = _download_trending_queries(region)
+        if queries:
+            try:
+                _store_trends_cache_entry(region, queries)
+            except (OSError, TimeoutError) as e:
+                log.warning(f"Could not update trends cache: {e}")
+        return queries
+    finally:
+        with _trends_refreshing_lock:
+            _trends_refreshing.discard(region)
+
+def fetch_trending_queries(limit=100, region='global', ttl=None):
+    """
+    Returns trending search queries for a region, served from the on-disk
+    cache when possible. Stale entries (older than `ttl`, default
+    TRENDS_CACHE_TTL seconds) are returned immediately while a background
+    thread refreshes them. With no cached entry the fetch is synchronous.
+    If nothing is cached and fetching fails, returns None.
+    """
+    region = _trends_region(region)
+    ttl = TRENDS_CACHE_TTL if ttl is None else ttl
+    entry = _load_trends_cache().get(region)
+
+    if entry and entry.get('queries'):
+        if time.time() - entry.get('fetched_at', 0) > ttl:
+            with _trends_refreshing_lock:
+                start_refresh = region not in _trends_refreshing
+                _trends_refreshing.add(region)
+            if start_refresh:
+                threading.Thread(target=_refresh_trending_queries, args=(region,),
+                                 name=f"Trends-Refresh-{region}", daemon=True).start()
+        return list(entry['queries'][:limit])
+
+    with _trends_refreshing_lock:
+        _trends_refreshing.add(region)
+    queries = _refresh_trending_queries(region)
+    return queries[:limit] if queries else None
+
 # Expanded topic pools for variety
 BASE_TOPICS = [
     "AI image generator", "World Cup", "Bitcoin price", "Stock market today",
@@ -114,101 +341,620 @@ MODIFIERS = [
     "today", "this week", "explained", "tutorial", "beginner", "advanced", "free", "cheap"
 ]
 
-def generate_dynamic_topics(count=30):
+# Opt-in WebDriver instrumentation: every driver command and every sleep is
+# recorded with its duration and the current phase, one JSONL file per session
+INSTRUMENT_DIR = os.path.join(CACHE_DIR, "traces")
+INSTRUMENT_DEFAULT = os.environ.get("SEARCH_AUTOMATION_INSTRUMENT") == "1"
+INSTRUMENT_PHASES = ['launch', 'homepage', 'typing', 'results', 'engagement', 'inter-search wait']
+
+# The recorder of the session running on this thread, if any (one browser
+# session per thread), so module-level sleeps can be attributed to it
+_instrumentation = threading.local()
+
+class SessionRecorder:
     """
-    Generates dynamic, varied search topics that are different each time.
+    Records WebDriver commands and sleeps for one browser session, tagged with
+    the current phase, to a JSONL file, and keeps per-phase totals.
+    """
+
+    def __init__(self, browser, path=None):
+        import datetime
+
+        self.browser = browser
+        self.session = f"{browser}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}"
+        self.path = path or os.path.join(INSTRUMENT_DIR, f"{self.session}.jsonl")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.phase = None
+        self._phase_started = time.time()
+        self.totals = {}
+
+    def _phase_totals(self, phase):
+        return self.totals.setdefault(phase, {
+            'wall': 0.0, 'commands': 0, 'command_time': 0.0, 'errors': 0,
+            'sleep_time': 0.0, 'page_pause_time': 0.0, 'intended_wait': 0.0,
+        })
+
+    def set_phase(self, phase):
+        now = time.time()
+        if self.phase is not None:
+            self._phase_totals(self.phase)['wall'] += now - self._phase_started
+        self.phase = phase
+        self._phase_started = now
+
+    def record(self, kind, name, duration, outcome='ok', **extra):
+        phase = self.phase or 'launch'
+        totals = self._phase_totals(phase)
+        if kind == 'command':
+            totals['commands'] += 1
+            totals['command_time'] += duration
+            if outcome != 'ok':
+                totals['errors'] += 1
+        elif kind == 'sleep':
+            totals['sleep_time'] += duration
+            totals['intended_wait'] += extra.get('requested', duration)
+        elif kind == 'page_pause':
+            totals['page_pause_time'] += duration
+            totals['intended_wait'] += extra.get('requested', duration)
+        elif kind == 'launch':
+            totals['wall'] += duration
+        entry = {'ts': time.time(), 'session': self.session, 'browser': self.browser,
+                 'phase': phase, 'kind': kind, 'name': name,
+                 'duration': round(duration, 6), 'outcome': outcome}
+        entry.update(extra)
+        self._file.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        self.set_phase(None)
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+    def print_summary(self):
+        """Prints per-phase wall time split into commands, sleeps and the rest."""
+        print(f"\nLatency breakdown for {self.browser.upper()} (trace: {self.path}, clock: {CLOCK}):")
+        print(f"  {'phase':<18} {'wall':>8} {'commands':>9} {'cmd time':>9} {'sleeps':>8} {'in-page':>8} {'other':>8} {'errors':>6} {'intended':>9}")
+        phases = [p for p in INSTRUMENT_PHASES if p in self.totals]
+        phases += [p for p in self.totals if p not in INSTRUMENT_PHASES]
+        for phase in phases:
+            t = self.totals[phase]
+            # Async scripts and batched actions include their in-page pauses
+            command_time = t['command_time'] - t['page_pause_time']
+            other = t['wall'] - t['command_time'] - t['sleep_time']
+            print(f"  {phase:<18} {t['wall']:7.1f}s {t['commands']:9d} {command_time:8.1f}s "
+                  f"{t['sleep_time']:7.1f}s {t['page_pause_time']:7.1f}s {max(other, 0.0):7.1f}s {t['errors']:6d} "
+                  f"{t['intended_wait']:8.1f}s")
+
+def instrument_driver(driver, recorder):
+    """
+    Wraps driver.execute - the single path every WebDriver command takes -
+    so each command is recorded, and makes `recorder` current for this thread.
+    """
+    execute = driver.execute
+
+    def recording_execute(driver_command, params=None):
+        started = time.time()
+        try:
+            result = execute(driver_command, params)
+        except Exception as e:
+            recorder.record('command', driver_command, time.time() - started, 'error', error=type(e).__name__)
+            raise
+        recorder.record('command', driver_command, time.time() - started)
+        return result
+
+    driver.execute = recording_execute
+    driver._recorder = recorder
+    _instrumentation.recorder = recorder
+    return driver
+
+def set_phase(phase):
+    """Tags subsequent commands and sleeps on this thread with `phase`, and reports it to METRICS."""
+    recorder = getattr(_instrumentation, 'recorder', None)
+    if recorder is not None:
+        recorder.set_phase(phase)
+    browser = _log_context.get().get('browser')
+    if browser:
+        METRICS.set_phase(browser, phase)
+
+class Clock:
+    """
+    The single source of every intentional wait (human pauses, typing and
+    scroll pauses, inter-search waits). `compression` divides each wait:
+    1 is real time, 100 runs waits 100x faster, and 'zero' skips them, which
+    leaves only harness and browser time - useful for benchmarks. Callers keep
+    logging the intended durations; only the actual wait is scaled.
+    Deadlines (page-readiness timeouts) are not intentional waits and stay real.
+    """
+
+    def __init__(self, compression=1.0):
+        self.set_compression(compression)
+        self.reset_lateness()
+
+    def set_compression(self, compression):
+        if str(compression).lower() == 'zero':
+            self.compression = 0.0
+        else:
+            compression = float(compression)
+            if compression <= 0:
+                raise ValueError("compression must be positive or 'zero'")
+            self.compression = compression
+
+    def scale(self, seconds):
+        """Returns how long an intended wait of `seconds` actually lasts."""
+        if self.compression == 0.0:
+            return 0.0
+        return seconds / self.compression
+
+    def sleep(self, seconds):
+        actual = self.scale(seconds)
+        if actual > 0:
+            started = time.perf_counter()
+            time.sleep(actual)
+            self._record_lateness(time.perf_counter() - started - actual)
+
+    async def wait(self, seconds):
+        """sleep() for coroutines: awaits instead of blocking the thread."""
+        import asyncio
+
+        actual = self.scale(seconds)
+        if actual > 0:
+            started = time.perf_counter()
+            await asyncio.sleep(actual)
+            self._record_lateness(time.perf_counter() - started - actual)
+
+    def reset_lateness(self):
+        self._lateness_lock = threading.Lock()
+        self.waits = 0
+        self.lateness = 0.0  # total seconds waits overran, i.e. scheduling delay
+
+    def _record_lateness(self, late):
+        with self._lateness_lock:
+            self.waits += 1
+            self.lateness += max(late, 0.0)
+
+    def __str__(self):
+        if self.compression == 0.0:
+            return "zero"
+        return "real time" if self.compression == 1.0 else f"{self.compression:g}x"
+
+CLOCK = Clock(os.environ.get("SEARCH_AUTOMATION_TIME_COMPRESSION", 1.0))
+
+def _record_page_pause(seconds):
+    """Records pauses that run inside the page (async scripts, W3C actions)."""
+    recorder = getattr(_instrumentation, 'recorder', None)
+    if recorder is not None:
+        recorder.record('page_pause', 'in-page pause', CLOCK.scale(seconds), requested=seconds)
+
+def _sleep(seconds):
+    """Waits `seconds` of intended time on CLOCK, recording it if instrumented."""
+    started = time.time()
+    CLOCK.sleep(seconds)
+    recorder = getattr(_instrumentation, 'recorder', None)
+    if recorder is not None:
+        recorder.record('sleep', 'sleep', time.time() - started, requested=seconds)
+
+# Live metrics for run_all_browsers_parallel --metrics-port (Prometheus text
+# format, localhost only). Updates are a few dict writes under one lock;
+# formatting happens only when the endpoint is scraped.
+METRICS_PORT = int(os.environ.get("SEARCH_AUTOMATION_METRICS_PORT", "0"))  # 0 = off
+METRICS_PHASES = ['queued', 'launch'] + INSTRUMENT_PHASES[1:] + ['daemon job', 'finished']
+SEARCH_LATENCY_BUCKETS = (5, 10, 15, 20, 30, 45, 60, 90, 120)
+
+class SearchMetrics:
+    """Per-browser search counters, current phase, latency histogram and next-search deadline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._browsers = {}
+
+    def _state(self, browser):
+        state = self._browsers.get(browser)
+        if state is None:
+            state = self._browsers[browser] = {
+                'completed': 0, 'failed': 0, 'restarts': 0, 'phase': None, 'next_search_at': None,
+                'latency_buckets': [0] * len(SEARCH_LATENCY_BUCKETS), 'latency_count': 0, 'latency_sum': 0.0,
+            }
+        return state
+
+    def set_phase(self, browser, phase):
+        with self._lock:
+            state = self._state(browser)
+            state['phase'] = phase
+            if phase != 'inter-search wait':
+                state['next_search_at'] = None
+
+    def set_next_search(self, browser, seconds):
+        """The next search starts in `seconds` (actual, not intended, time)"""
+        with self._lock:
+            self._state(browser)['next_search_at'] = time.time() + seconds
+
+    def record_restart(self, browser):
+        with self._lock:
+            self._state(browser)['restarts'] += 1
+
+    def record_search(self, browser, result):
+        """Counts one finished search from run_search_sequence's results"""
+        with self._lock:
+            state = self._state(browser)
+            if result['outcome'] not in ('success', 'direct_url'):
+                state['failed'] += 1
+                return
+            state['completed'] += 1
+            latency = (result['ended'] or time.time()) - result['started']
+            state['latency_count'] += 1
+            state['latency_sum'] += latency
+            for i, bound in enumerate(SEARCH_LATENCY_BUCKETS):
+                if latency <= bound:
+                    state['latency_buckets'][i] += 1
+
+    def render(self):
+        """The current values in Prometheus text exposition format"""
+        with self._lock:
+            browsers = {name: dict(state, latency_buckets=list(state['latency_buckets']))
+                        for name, state in self._browsers.items()}
+        now = time.time()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+
+        metric("search_automation_searches_completed_total", "counter", "Searches that reached results.",
+               [((('browser', b),), s['completed']) for b, s in browsers.items()])
+        metric("search_automation_searches_failed_total", "counter", "Searches that failed or were cut short.",
+               [((('browser', b),), s['failed']) for b, s in browsers.items()])
+        metric("search_automation_session_restarts_total", "counter", "Browser relaunches after a lost session.",
+               [((('browser', b),), s['restarts']) for b, s in browsers.items()])
+        metric("search_automation_phase", "gauge", "1 for the phase each browser is in.",
+               [((('browser', b), ('phase', p)), 1 if s['phase'] == p else 0)
+                for b, s in browsers.items() for p in METRICS_PHASES])
+        metric("search_automation_next_search_seconds", "gauge", "Seconds until the next search starts (0 if not waiting).",
+               [((('browser', b),), max(0.0, s['next_search_at'] - now) if s['next_search_at'] else 0)
+                for b, s in browsers.items()])
+
+        name = "search_automation_search_duration_seconds"
+        lines.append(f"# HELP {name} Time from starting a search to finishing engagement, completed searches only.")
+        lines.append(f"# TYPE {name} histogram")
+        for b, s in browsers.items():
+            for bound, count in zip(SEARCH_LATENCY_BUCKETS, s['latency_buckets']):
+                lines.append(f'{name}_bucket{{browser="{b}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{browser="{b}",le="+Inf"}} {s["latency_count"]}')
+            lines.append(f'{name}_sum{{browser="{b}"}} {s["latency_sum"]:.3f}')
+            lines.append(f'{name}_count{{browser="{b}"}} {s["latency_count"]}')
+        return "\n".join(lines) + "\n"
+
+METRICS = SearchMetrics()
+
+def start_metrics_server(port=METRICS_PORT, metrics=None):
+    """
+    Serves `metrics` (default METRICS) at http://127.0.0.1:<port>/metrics from
+    a background thread. Returns the server; call shutdown() to stop it.
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    metrics = metrics or METRICS
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes are not run progress
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="Metrics-Server", daemon=True).start()
+    return server
+
+def _time_based_topics():
+    """
+    Date-stamped topics for uniqueness, e.g. 'news December 2025'.
     """
     import datetime
-    
-    topics = []
-    used_topics = set()
-    
-    # Add some time-based topics for uniqueness
+
     current_time = datetime.datetime.now()
-    time_based_topics = [
+    return [
         f"news {current_time.strftime('%B %Y')}",
         f"weather {current_time.strftime('%A')}",
         f"events {current_time.strftime('%B %d')}",
         f"trending {current_time.strftime('%Y')}",
         f"updates {current_time.strftime('%B')}"
     ]
-    
-    # Add time-based topics first
-    for topic in time_based_topics[:5]:
-        if topic not in used_topics:
-            topics.append(topic)
-            used_topics.add(topic)
-    
-    # Generate topics from categories
-    categories = list(TOPIC_CATEGORIES.keys())
-    random.shuffle(categories)
-    
-    for category in categories:
-        if len(topics) >= count:
-            break
-            
-        category_topics = TOPIC_CATEGORIES[category].copy()
-        random.shuffle(category_topics)
-        
-        # Take 3-5 topics from each category
-        for topic in category_topics[:random.randint(3, 5)]:
-            if len(topics) >= count:
-                break
-                
-            # Sometimes add modifiers for variety
-            if random.random() < 0.6:  # 60% chance
-                modifier = random.choice(MODIFIERS)
-                if random.choice([True, False]):
-                    enhanced_topic = f"{modifier} {topic}"
-                else:
-                    enhanced_topic = f"{topic} {modifier}"
-            else:
-                enhanced_topic = topic
-            
-            if enhanced_topic not in used_topics:
-                topics.append(enhanced_topic)
-                used_topics.add(enhanced_topic)
-    
-    # Fill remaining slots with base topics if needed
-    remaining_base = BASE_TOPICS.copy()
-    random.shuffle(remaining_base)
-    
-    for topic in remaining_base:
-        if len(topics) >= count:
-            break
-            
-        if topic not in used_topics:
-            # Add variation to base topics too
-            if random.random() < 0.4:  # 40% chance
-                modifier = random.choice(MODIFIERS)
-                enhanced_topic = f"{topic} {modifier}"
-            else:
-                enhanced_topic = topic
-                
-            if enhanced_topic not in used_topics:
-                topics.append(enhanced_topic)
-                used_topics.add(enhanced_topic)
-    
-    # Shuffle the final list
-    random.shuffle(topics)
-    return topics[:count]
 
-# Keep original for backward compatibility
-SAMPLE_TOPICS = generate_dynamic_topics(50)  # Generate 50 topics to choose from
+def _dedupe_casefold(items):
+    return list(dedupe_topics(items))
 
-def human_type(element, text, min_delay=0.05, max_delay=0.25):
+class TopicSpace:
     """
-    Types text character by character with human-like delays and occasional mistakes.
+    Index-addressable space of generated topics.
+
+    The space is every category topic bare, with a modifier before it or with
+    a modifier after it, plus every base topic bare or with a trailing
+    modifier. Each index maps to one topic and no two indices map to the same
+    topic (case-insensitively), so `sample(k)` draws k unique topics by
+    picking k indices without replacement - no retries or oversampling.
+    `pinned` topics (the time-based ones by default) lead every sample.
     """
-    actions = ActionChains(element.parent)
-    
-    # Clear the field first with realistic selection
-    element.click()
-    time.sleep(random.uniform(0.1, 0.3))
-    actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-    time.sleep(random.uniform(0.05, 0.15))
-    
-    # Type character by character
+
+    def __init__(self, categories=None, modifiers=None, base_topics=None, pinned=None):
+        categories = TOPIC_CATEGORIES if categories is None else categories
+        modifiers = MODIFIERS if modifiers is None else modifiers
+        base_topics = BASE_TOPICS if base_topics is None else base_topics
+
+        self.modifiers = _dedupe_casefold(modifiers)
+        modifier_keys = [m.casefold() for m in self.modifiers]
+
+        def is_modified_form(topic, atom_keys):
+            # True if `topic` is another atom with a modifier before/after it
+            key = topic.casefold()
+            for mk in modifier_keys:
+                if key.startswith(mk + " ") and key[len(mk) + 1:] in atom_keys:
+                    return True
+                if key.endswith(" " + mk) and key[:-len(mk) - 1] in atom_keys:
+                    return True
+            return False
+
+        # Drop atoms the space already produces some other way so every index
+        # stays distinct
+        category_atoms = _dedupe_casefold(t for topics in categories.values() for t in topics)
+        category_keys = {t.casefold() for t in category_atoms}
+        self.category_topics = [t for t in category_atoms if not is_modified_form(t, category_keys)]
+        category_keys = {t.casefold() for t in self.category_topics}
+        self.base_topics = [
+            t for t in _dedupe_casefold(base_topics)
+            if t.casefold() not in category_keys and not is_modified_form(t, category_keys)
+        ]
+        self.pinned = _dedupe_casefold(pinned or [])
+
+        self._category_stride = 1 + 2 * len(self.modifiers)  # bare, prefixed, suffixed
+        self._base_stride = 1 + len(self.modifiers)           # bare, suffixed
+        self._category_size = len(self.category_topics) * self._category_stride
+        self._indexed_size = self._category_size + len(self.base_topics) * self._base_stride
+
+    def __len__(self):
+        """Number of unique topics available (the capacity)."""
+        return len(self.pinned) + self._indexed_size
+
+    @property
+    def capacity(self):
+        return len(self)
+
+    def topic_at(self, index):
+        """
+        Returns the topic at `index` of the modifier space (pinned excluded).
+        """
+        if not 0 <= index < self._indexed_size:
+            raise IndexError("topic index out of range")
+        modifier_count = len(self.modifiers)
+        if index < self._category_size:
+            topic, slot = divmod(index, self._category_stride)
+            topic = self.category_topics[topic]
+            if slot == 0:
+                return topic
+            if slot <= modifier_count:
+                return f"{self.modifiers[slot - 1]} {topic}"
+            return f"{topic} {self.modifiers[slot - 1 - modifier_count]}"
+        topic, slot = divmod(index - self._category_size, self._base_stride)
+        topic = self.base_topics[topic]
+        if slot == 0:
+            return topic
+        return f"{topic} {self.modifiers[slot - 1]}"
+
+    def sample(self, k):
+        """
+        Returns k unique topics in random order, in O(k).
+        Raises ValueError if k exceeds the capacity.
+        """
+        if k < 0 or k > len(self):
+            raise ValueError(f"Cannot draw {k} unique topics from a space of {len(self)}")
+        topics = self.pinned[:k]
+        # random.sample on a range picks indices without building the range
+        for index in random.sample(range(self._indexed_size), k - len(topics)):
+            topics.append(self.topic_at(index))
+        random.shuffle(topics)
+        return topics
+
+def generate_dynamic_topics(count=30):
+    """
+    Generates dynamic, varied search topics that are different each time.
+    Returns exactly `count` unique topics, or the whole topic space if it
+    holds fewer (see TopicSpace.capacity).
+    """
+    space = TopicSpace(pinned=_time_based_topics())
+    return space.sample(min(count, len(space)))
+
+# Streaming topic pipeline shared by both entry points:
+#   topic_sources -> normalise_topics -> dedupe_topics -> vary_topics -> take_topics
+# Every stage is a generator, so only the topics actually taken are built.
+TOPIC_VARIATION_RATE = 0.3
+TOPIC_VARIATIONS = ["{topic} {year}", "{topic} news", "{topic} today", "{topic} latest",
+                    "best {topic}", "{topic} guide", "{topic} tips"]
+
+def _generated_topics(space):
+    """
+    Yields every topic of `space` once, in random order. Indices come from a
+    random affine permutation (a*i + b mod n with a coprime to n), so the
+    order is drawn without materialising the index range; pinned topics are
+    merged in at uniformly random positions.
+    """
+    import math
+
+    pinned = list(space.pinned)
+    random.shuffle(pinned)
+    size = len(space) - len(pinned)
+    step = random.randrange(1, size + 1) if size else 1
+    while math.gcd(step, size) != 1:
+        step = random.randrange(1, size + 1)
+    offset = random.randrange(size) if size else 0
+    i = 0
+    while i < size or pinned:
+        if pinned and random.randrange(size - i + len(pinned)) < len(pinned):
+            yield pinned.pop()
+        else:
+            yield space.topic_at((step * i + offset) % size)
+            i += 1
+
+def topic_sources(trend_limit=200, region='global', mix=0.25, space=None):
+    """
+    Yields raw topics: trending queries in random order with generated topics
+    mixed in at rate `mix`, then the rest of the generated topic space. With
+    trend_limit=0, or when no trends can be fetched, yields generated topics only.
+    """
+    generated = _generated_topics(space or TopicSpace(pinned=_time_based_topics()))
+    trends = fetch_trending_queries(limit=trend_limit, region=region) if trend_limit else None
+    if trends:
+        log.info(f"Using {len(trends)} trending queries from pytrends...")
+        random.shuffle(trends)
+        for trend in trends:
+            if random.random() < mix:
+                topic = next(generated, None)
+                if topic is not None:
+                    yield topic
+            yield trend
+    elif trend_limit:
+        log.warning("Couldn't fetch live trending queries; generating dynamic topics...")
+    yield from generated
+
+def normalise_topics(topics):
+    """Casefolds each topic and collapses runs of whitespace; drops blank topics"""
+    for topic in topics:
+        topic = " ".join(topic.split()).casefold()
+        if topic:
+            yield topic
+
+def dedupe_topics(topics):
+    """Yields each topic the first time it is seen (compared case-insensitively)"""
+    seen = set()
+    for topic in topics:
+        key = topic.casefold()
+        if key not in seen:
+            seen.add(key)
+            yield topic
+
+def vary_topics(topics, rate=TOPIC_VARIATION_RATE, year=None):
+    """
+    Rewrites a `rate` share of topics with a suffix or prefix ("news",
+    "best ...", the current year, ...) to make searches more unique.
+    """
+    import datetime
+
+    year = year or datetime.date.today().year
+    for topic in topics:
+        if random.random() < rate:
+            topic = random.choice(TOPIC_VARIATIONS).format(topic=topic, year=year)
+        yield topic
+
+def topic_pipeline(trend_limit=200, region='global', variation_rate=TOPIC_VARIATION_RATE, space=None):
+    """The full lazy pipeline; draw from it with take_topics()"""
+    topics = topic_sources(trend_limit, region, space=space)
+    return vary_topics(dedupe_topics(normalise_topics(topics)), rate=variation_rate)
+
+def take_topics(topics, count):
+    """
+    Partitioning stage: pulls the next `count` topics off a pipeline. Returns
+    fewer if the sources run dry. Splitting them between browsers is left to
+    TopicQueue, which hands them out as each browser is ready.
+    """
+    import itertools
+
+    return list(itertools.islice(topics, count))
+
+def run_pipeline_bench(count=20000, rounds=3):
+    """
+    Times each topic pipeline stage on its own over the same synthetic input,
+    then the peak allocation of drawing a 30-topic run from the full pipeline.
+    """
+    import tracemalloc
+
+    space = TopicSpace(pinned=_time_based_topics())
+    count = min(count, len(space))  # the space can't yield more unique topics
+    raw = take_topics(_generated_topics(space), count)
+    # Messy copies so normalisation and dedupe have work to do
+    raw += [f"  {topic.upper()}  " for topic in raw[:count // 4]]
+    normalised = list(normalise_topics(raw))
+    deduped = list(dedupe_topics(normalised))
+    stages = [
+        ("sources (generated)", lambda: take_topics(_generated_topics(space), count)),
+        ("normalise", lambda: list(normalise_topics(raw))),
+        ("dedupe", lambda: list(dedupe_topics(normalised))),
+        ("vary", lambda: list(vary_topics(deduped))),
+        ("take 30", lambda: take_topics(iter(deduped), 30)),
+    ]
+
+    print(f"Topic pipeline benchmark ({count} generated topics + {len(raw) - count} messy copies, "
+          f"best of {rounds}):")
+    for label, run in stages:
+        best = None
+        for _ in range(rounds):
+            started = time.perf_counter()
+            produced = len(run())
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        per_topic = best / max(produced, 1) * 1e6
+        print(f"  {label:<20} {best * 1000:8.2f} ms  {per_topic:6.3f} us/topic  ({produced} out)")
+
+    tracemalloc.start()
+    take_topics(topic_pipeline(trend_limit=0, space=space), 30)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  Full pipeline, 30 topics drawn from a space of {len(space)}: peak {peak / 1024:.1f} KiB")
+
+def __getattr__(name):
+    """
+    Builds SAMPLE_TOPICS on first access instead of at import time.
+    """
+    if name == "SAMPLE_TOPICS":
+        # Keep original for backward compatibility
+        topics = generate_dynamic_topics(50)  # Generate 50 topics to choose from
+        globals()["SAMPLE_TOPICS"] = topics
+        return topics
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def run_startup_bench():
+    """
+    Reports cold import time for each component, each measured in a fresh interpreter.
+    """
+    import os
+    import subprocess
+    import sys
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    print("Startup benchmark (cold import, fresh interpreter per component):")
+    for label, statement in STARTUP_COMPONENTS:
+        code = (
+            "import time; _t = time.perf_counter(); "
+            f"{statement}; "
+            "print(f'{time.perf_counter() - _t:.4f}')"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True)
+        if proc.returncode == 0:
+            elapsed = float(proc.stdout.strip().splitlines()[-1])
+            print(f"  {label:<40} {elapsed * 1000:8.1f} ms")
+        else:
+            error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+            print(f"  {label:<40} unavailable ({error})")
+
+def _plan_keystrokes(text, min_delay=0.05, max_delay=0.25):
+    """
+    Builds the human-like keystroke sequence for `text` as (key, pause)
+    pairs, including typo/backspace corrections and hesitations. A key of
+    None is a pause on its own.
+    """
+    from selenium.webdriver.common.keys import Keys
+
+    plan = []
     for i, char in enumerate(text):
         # Random typing speed variation
         if char == ' ':
@@ -223,22 +969,108 @@ def human_type(element, text, min_delay=0.05, max_delay=0.25):
             # Type wrong character, pause, then backspace and correct
             wrong_chars = 'qwertyuiopasdfghjklzxcvbnm'
             wrong_char = random.choice(wrong_chars)
-            element.send_keys(wrong_char)
-            time.sleep(random.uniform(0.1, 0.3))
-            element.send_keys(Keys.BACKSPACE)
-            time.sleep(random.uniform(0.05, 0.2))
+            plan.append((wrong_char, random.uniform(0.1, 0.3)))
+            plan.append((Keys.BACKSPACE, random.uniform(0.05, 0.2)))
         
-        element.send_keys(char)
-        time.sleep(delay)
+        plan.append((char, delay))
         
         # Occasional hesitation (10% chance)
         if random.random() < 0.1:
-            time.sleep(random.uniform(0.3, 0.8))
+            plan.append((None, random.uniform(0.3, 0.8)))
+    return plan
+
+def human_type(element, text, min_delay=0.05, max_delay=0.25, mode='batched'):
+    """
+    Types text character by character with human-like delays and occasional mistakes.
+    mode='batched' sends the whole keystroke sequence, pauses included, as one
+    W3C Actions payload (one perform()); mode='per_key' sends each key with
+    its own send_keys call and sleeps in Python.
+    Returns the total intentional delay in seconds.
+    """
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.keys import Keys
+
+    # Clear the field first with realistic selection
+    element.click()
+    click_pause = random.uniform(0.1, 0.3)
+    _sleep(click_pause)
+    select_pause = random.uniform(0.05, 0.15)
+    plan = _plan_keystrokes(text, min_delay, max_delay)
+    planned_delay = click_pause + select_pause + sum(pause for _, pause in plan)
+
+    actions = ActionChains(element.parent)
+    actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL)
+
+    if mode == 'per_key':
+        actions.perform()
+        _sleep(select_pause)
+        for key, pause in plan:
+            if key is not None:
+                element.send_keys(key)
+            _sleep(pause)
+        return planned_delay
+
+    # Type character by character - the browser plays back keys and pauses
+    actions.pause(CLOCK.scale(select_pause))
+    for key, pause in plan:
+        if key is not None:
+            actions.send_keys(key)
+        if CLOCK.scale(pause) > 0:
+            actions.pause(CLOCK.scale(pause))
+    actions.perform()
+    _record_page_pause(select_pause + sum(pause for _, pause in plan))
+    return planned_delay
+
+# Local page for --typing-bench, so typing can be measured without Bing
+TYPING_BENCH_PAGE = "data:text/html,<input name='q' autofocus>"
+
+def run_typing_bench(browser='edge', text="best programming languages 2025", rounds=3, headless=True):
+    """
+    Compares human_type's per-key and batched modes on a local page: WebDriver
+    commands sent, wall time, and harness overhead (wall time minus the
+    intentional pauses). Also checks each mode leaves exactly `text` typed.
+    """
+    from selenium.webdriver.common.by import By
+
+    driver = build_browser_driver(browser=browser, headless=headless)
+    # Every WebDriver command goes through driver.execute; count them
+    commands = [0]
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        commands[0] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    try:
+        driver.get(TYPING_BENCH_PAGE)
+        box = driver.find_element(By.NAME, "q")
+        print(f"\nTyping benchmark on {browser.upper()}: {len(text)} characters x {rounds} rounds")
+        for mode in ('per_key', 'batched'):
+            results = []
+            for _ in range(rounds):
+                commands[0] = 0
+                started = time.time()
+                planned = human_type(box, text, mode=mode)
+                elapsed = time.time() - started
+                sent = commands[0]
+                typed_ok = box.get_attribute('value') == text
+                results.append((sent, elapsed, elapsed - CLOCK.scale(planned), typed_ok))
+            avg_commands = sum(r[0] for r in results) / rounds
+            avg_elapsed = sum(r[1] for r in results) / rounds
+            avg_overhead = sum(r[2] for r in results) / rounds
+            all_ok = all(r[3] for r in results)
+            print(f"  {mode:<8} commands {avg_commands:6.1f}  wall {avg_elapsed:6.2f}s  "
+                  f"overhead {avg_overhead:6.2f}s  text {'ok' if all_ok else 'MISMATCH'}")
+    finally:
+        driver.quit()
 
 def human_mouse_movement(driver, element):
     """
     Moves mouse to element in a human-like curved path.
     """
+    from selenium.webdriver.common.action_chains import ActionChains
+
     actions = ActionChains(driver)
     
     # Get current window size for realistic movement
@@ -267,49 +1099,101 @@ def human_mouse_movement(driver, element):
         current_y = start_y + (target_y - start_y) * progress + curve_offset_y
         
         # Small random delay between movements
-        time.sleep(random.uniform(0.01, 0.03))
+        _sleep(random.uniform(0.01, 0.03))
     
     # Final move to exact element
     actions.move_to_element(element).perform()
-    time.sleep(random.uniform(0.1, 0.3))
+    _sleep(random.uniform(0.1, 0.3))
 
 def human_click(driver, element):
     """
     Performs a human-like click with mouse movement and realistic timing.
     """
+    from selenium.webdriver.common.action_chains import ActionChains
+
     # Move mouse to element first
     human_mouse_movement(driver, element)
     
     # Brief pause before clicking (like humans do)
-    time.sleep(random.uniform(0.1, 0.4))
+    _sleep(random.uniform(0.1, 0.4))
     
     # Click with slight randomness in timing
     actions = ActionChains(driver)
     actions.click(element).perform()
     
     # Brief pause after click
-    time.sleep(random.uniform(0.1, 0.3))
+    _sleep(random.uniform(0.1, 0.3))
+
+# Runs a list of [op, amount, pause_ms] scroll steps inside the page and
+# calls back once, so a whole scroll routine costs one WebDriver round trip.
+#   'to'       - scrollTo(0, amount)
+#   'by'       - scrollBy(0, amount)
+#   'viewport' - scrollBy(0, innerHeight * amount)
+#   'fraction' - scrollTo(0, scrollHeight * amount); remaining 'fraction'
+#                steps are skipped once the bottom of the page is reached
+SCROLL_PLAN_SCRIPT = """
+var steps = arguments[0];
+var done = arguments[arguments.length - 1];
+var i = 0;
+var atBottom = false;
+function next() {
+    while (i < steps.length && atBottom && steps[i][0] === 'fraction') { i++; }
+    if (i >= steps.length) { done(window.scrollY); return; }
+    var step = steps[i++];
+    if (step[0] === 'to') {
+        window.scrollTo(0, step[1]);
+    } else if (step[0] === 'by') {
+        window.scrollBy(0, step[1]);
+    } else if (step[0] === 'viewport') {
+        window.scrollBy(0, window.innerHeight * step[1]);
+    } else if (step[0] === 'fraction') {
+        var height = document.body.scrollHeight;
+        var target = Math.min(height, Math.floor(height * step[1]));
+        window.scrollTo(0, target);
+        atBottom = target >= height;
+    }
+    setTimeout(next, step[2]);
+}
+next();
+"""
+
+def run_scroll_plan(driver, plan):
+    """
+    Executes a scroll plan - a list of (op, amount, pause_seconds) steps, see
+    SCROLL_PLAN_SCRIPT - as one async script, pausing inside the page.
+    """
+    # The whole routine runs inside one script call, so the session's script
+    # timeout must cover the sum of its pauses
+    needed = CLOCK.scale(sum(pause for _, _, pause in plan)) + 10
+    if getattr(driver, '_scroll_script_timeout', 0) < needed:
+        timeout = max(needed, 60)
+        driver.set_script_timeout(timeout)
+        driver._scroll_script_timeout = timeout
+    steps = [[op, amount, int(CLOCK.scale(pause) * 1000)] for op, amount, pause in plan]
+    result = driver.execute_async_script(SCROLL_PLAN_SCRIPT, steps)
+    _record_page_pause(sum(pause for _, _, pause in plan))
+    return result
 
 def simulate_reading_behavior(driver):
     """
     Simulates human reading behavior - random scrolls, pauses, etc.
     """
+    plan = []
     # Random small scrolls as if reading
     for _ in range(random.randint(2, 5)):
         scroll_amount = random.randint(50, 200)
-        driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-        time.sleep(random.uniform(0.8, 2.5))  # Reading time
+        plan.append(('by', scroll_amount, random.uniform(0.8, 2.5)))  # Reading time
         
         # Occasional scroll back up (like re-reading)
         if random.random() < 0.3:
             back_scroll = random.randint(20, 100)
-            driver.execute_script(f"window.scrollBy(0, -{back_scroll});")
-            time.sleep(random.uniform(0.5, 1.2))
+            plan.append(('by', -back_scroll, random.uniform(0.5, 1.2)))
     
     # Sometimes scroll to bottom of visible area
     if random.random() < 0.4:
-        driver.execute_script("window.scrollBy(0, window.innerHeight * 0.8);")
-        time.sleep(random.uniform(1.0, 2.0))
+        plan.append(('viewport', 0.8, random.uniform(1.0, 2.0)))
+
+    run_scroll_plan(driver, plan)
 
 def random_human_pause():
     """
@@ -318,161 +1202,692 @@ def random_human_pause():
     pause_type = random.choice(['short', 'medium', 'long', 'thinking'])
     
     if pause_type == 'short':
-        time.sleep(random.uniform(0.3, 0.8))
+        _sleep(random.uniform(0.3, 0.8))
     elif pause_type == 'medium':
-        time.sleep(random.uniform(0.8, 1.5))
+        _sleep(random.uniform(0.8, 1.5))
     elif pause_type == 'long':
-        time.sleep(random.uniform(1.5, 3.0))
+        _sleep(random.uniform(1.5, 3.0))
     elif pause_type == 'thinking':
-        time.sleep(random.uniform(2.0, 4.0))
+        _sleep(random.uniform(2.0, 4.0))
+
+# Everything the helpers look up on a Bing page, gathered by one script so a
+# page costs one WebDriver round trip instead of a query per element. Element
+# values come back as WebElements.
+PAGE_SNAPSHOT_SCRIPT = """
+function all(selector, limit) {
+    return Array.prototype.slice.call(document.querySelectorAll(selector), 0, limit);
+}
+return {
+    url: location.href,
+    ready_state: document.readyState,
+    search_box: document.querySelector('[name="q"]'),
+    results: all("h2 a, .b_title a, .b_algo h2 a, [data-testid='result'] a", 8).map(function (a) {
+        return {element: a, href: a.href || ''};
+    }),
+    images_tab: document.querySelector("a[href*='images']"),
+    news_tab: document.querySelector("a[href*='news']"),
+    web_tab: document.querySelector("a[href*='search'][href*='q=']"),
+    consent_buttons: all('button', 12).map(function (b) {
+        return {element: b, text: (b.innerText || b.textContent || '').trim()};
+    }),
+    related_searches: all(".b_rs, .related-search, .suggestion, [data-testid*='suggestion']", 3),
+    account_indicators: all("[data-testid='profile-button'], .id_button, .profile, [aria-label*='Account'], .me-control", 5),
+    rewards_elements: all(".rewards, .rewardsbadge, .ms-rewards, [data-testid*='reward'], .earnpoints", 5),
+    homepage_elements: all(".hp_sw_logo, .hp_sw, .b_searchbox, .news, .trending, .hp_bottom", 3)
+};
+"""
+
+def snapshot_page(driver):
+    """
+    Returns a structured snapshot of the current page in one round trip:
+    search box, organic result links with hrefs, tab links, consent buttons,
+    related searches, account indicators and rewards/homepage elements.
+    Elements in a snapshot go stale once the page navigates.
+    """
+    return driver.execute_script(PAGE_SNAPSHOT_SCRIPT)
+
+def perform_rewards_qualifying_actions(driver, search_term, snapshot=None):
+    """
+    Performs specific actions that help qualify searches for Microsoft Rewards.
+    Returns True if it navigated away and back (so `snapshot` is now stale).
+    """
+    navigated = False
+    try:
+        if snapshot is None:
+            snapshot = snapshot_page(driver)
+
+        # Check for Bing rewards-related elements
+        if snapshot['rewards_elements']:
+            log.debug("Microsoft Rewards elements detected")
+        
+        # Look for and interact with different search result types
+        # Images tab (sometimes helps with variety)
+        if random.random() < 0.2:  # 20% chance
+            try:
+                images_tab = snapshot['images_tab']
+                if images_tab:
+                    log.debug("Checking images results...")
+                    human_click(driver, images_tab)
+                    navigated = True
+                    _sleep(random.uniform(2, 4))
+                    # Go back to web results
+                    web_tab = snapshot_page(driver)['web_tab']
+                    if web_tab:
+                        human_click(driver, web_tab)
+                        _sleep(random.uniform(1, 2))
+            except Exception:
+                pass
+        
+        # Look for news results (another variety signal)
+        if random.random() < 0.2:  # 20% chance
+            try:
+                news_tab = snapshot_page(driver)['news_tab'] if navigated else snapshot['news_tab']
+                if news_tab:
+                    log.debug("Checking news results...")
+                    human_click(driver, news_tab)
+                    navigated = True
+                    _sleep(random.uniform(2, 4))
+                    # Go back to web results
+                    web_tab = snapshot_page(driver)['web_tab']
+                    if web_tab:
+                        human_click(driver, web_tab)
+                        _sleep(random.uniform(1, 2))
+            except Exception:
+                pass
+        
+        # Interact with search suggestions or related searches
+        try:
+            related_searches = snapshot_page(driver)['related_searches'] if navigated else snapshot['related_searches']
+            if related_searches and random.random() < 0.1:  # 10% chance
+                suggestion = random.choice(related_searches[:3])
+                log.debug("Checking related search suggestion...")
+                human_mouse_movement(driver, suggestion)
+                _sleep(random.uniform(0.5, 1.0))
+        except Exception:
+            pass
+            
+    except Exception as e:
+        log.warning(f"Could not perform rewards actions: {e}")
+    return navigated
+
+# Page-readiness conditions, evaluated in the page. Each wait polls its
+# condition until true or until its deadline, replacing a fixed sleep.
+READY_CONDITIONS = {
+    'document': "return document.readyState === 'complete';",
+    'search_box': "return document.readyState !== 'loading' && !!document.querySelector('[name=\"q\"]');",
+    'results': ("return document.readyState !== 'loading' && "
+                "!!document.querySelector('#b_results, .b_algo, [data-testid=\"result\"]');"),
+    # 'results', but only once the page marked by NAVIGATION_MARK_SCRIPT has
+    # been replaced (new document) or has moved to another URL
+    'new_results': ("var mark = window.__searchAutomationMark; "
+                    "return (mark === undefined || mark !== location.href) && "
+                    "document.readyState !== 'loading' && "
+                    "!!document.querySelector('#b_results, .b_algo, [data-testid=\"result\"]');"),
+}
+# Run before an action that navigates, so 'new_results' can't pass on the old page
+NAVIGATION_MARK_SCRIPT = "window.__searchAutomationMark = location.href;"
+
+def wait_for_page_ready(driver, condition='document', timeout=10.0, replaces=None, readiness_log=None, label=None):
+    """
+    Waits until a READY_CONDITIONS check passes or `timeout` seconds elapse.
+    Returns the time waited. If `readiness_log` (a list) is given, appends
+    the wait together with the fixed sleep range it `replaces`, so the run
+    can report time saved.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    script = READY_CONDITIONS[condition]
+    started = time.time()
+    timed_out = False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(lambda d: d.execute_script(script))
+    except Exception:
+        # Deadline reached (or the page could not be queried); carry on
+        timed_out = True
+    waited = time.time() - started
+    if readiness_log is not None:
+        replaced = sum(replaces) / 2 if replaces else 0.0
+        readiness_log.append({
+            'label': label or condition,
+            'waited': waited,
+            'replaced': replaced,
+            'timed_out': timed_out,
+        })
+    if timed_out:
+        log.warning(f"Page not ready after {timeout:.0f}s ({label or condition}); continuing")
+    return waited
+
+def summarize_readiness(readiness_log):
+    """
+    Returns (waited, saved) totals for a list of readiness waits, where saved
+    is measured against the midpoint of the fixed sleeps they replaced.
+    """
+    waited = sum(entry['waited'] for entry in readiness_log)
+    saved = sum(entry['replaced'] - entry['waited'] for entry in readiness_log)
+    return waited, saved
+
+def print_readiness_report(readiness_report):
+    """
+    Logs time waited and saved per search for a run's readiness waits, as one record.
+    """
+    searches = [(idx, topic, waits) for idx, topic, waits in readiness_report if waits]
+    if not searches:
+        return
+    lines = ["Page readiness report (vs fixed post-action sleeps):"]
+    total_saved = 0.0
+    for idx, topic, waits in searches:
+        waited, saved = summarize_readiness(waits)
+        total_saved += saved
+        timeouts = sum(1 for entry in waits if entry['timed_out'])
+        note = f", {timeouts} timed out" if timeouts else ""
+        lines.append(f"  [{idx}] {topic[:40]:<40} waited {waited:5.1f}s  saved {saved:5.1f}s{note}")
+    lines.append(f"  Total saved: {total_saved:.1f}s over {len(searches)} page visits "
+                 f"({total_saved / len(searches):.1f}s each)")
+    log.info("\n".join(lines))
+
+def click_search_result(driver, readiness_log=None, snapshot=None):
+    """
+    Occasionally clicks on search results to show genuine engagement.
+    Uses `snapshot` (see snapshot_page) if it is still current for the page.
+    """
+    try:
+        if snapshot is None:
+            snapshot = snapshot_page(driver)
+
+        # Filter out ad results and keep only organic results (the snapshot
+        # holds the first 8 result links with their hrefs)
+        organic_results = []
+        for result in snapshot['results']:
+            href = result['href']
+            # Skip ads, Microsoft sites, and suspicious links
+            if (href and 
+                'bing.com/aclick' not in href and 
+                'msn.com/aclick' not in href and
+                len(href) > 20):
+                organic_results.append(result['element'])
+        
+        if organic_results:
+            # Click on a random organic result
+            result_to_click = random.choice(organic_results[:5])  # Top 5 results only
+            log.debug("Clicking on search result for deeper engagement...")
+            
+            # Scroll to result first
+            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", result_to_click)
+            _sleep(random.uniform(1, 2))
+            
+            # Human-like click
+            human_click(driver, result_to_click)
+            
+            # Stay on the page briefly (like reading)
+            _sleep(random.uniform(3, 8))
+            
+            # Sometimes scroll on the destination page
+            if random.random() < 0.7:  # 70% chance
+                scroll_amount = random.randint(200, 600)
+                driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
+                _sleep(random.uniform(2, 4))
+            
+            # Go back to search results
+            driver.back()
+            wait_for_page_ready(driver, 'results', timeout=10, replaces=(2, 4),
+                                readiness_log=readiness_log, label='back to results')
+            log.debug("Returned to search results")
+            
+    except Exception as e:
+        log.warning(f"Could not click search result: {e}")
+
+# Maps each browser to the driver that last worked for its installed version
+DRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "driver_cache.json")
+_driver_cache_lock = threading.Lock()
+
+# Driver downloads share webdriver_manager's cache directory (and Chrome/Brave
+# share a ChromeDriver), so parallel launches serialise only this step
+_driver_download_lock = threading.Lock()
+
+# Where to read the installed browser version without touching the network
+BROWSER_VERSION_SOURCES = {
+    'edge': {
+        'registry': (r"Software\Microsoft\Edge\BLBeacon", "version"),
+        'commands': ["microsoft-edge", "microsoft-edge-stable", "msedge",
+                     "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"],
+    },
+    'chrome': {
+        'registry': (r"Software\Google\Chrome\BLBeacon", "version"),
+        'commands': ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                     "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    },
+    'brave': {
+        'registry': (r"Software\BraveSoftware\Brave-Browser\BLBeacon", "version"),
+        'commands': ["brave-browser", "brave",
+                     "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"],
+    },
+    'firefox': {
+        'registry': (r"Software\Mozilla\Mozilla Firefox", "CurrentVersion"),
+        'commands': ["firefox", "/Applications/Firefox.app/Contents/MacOS/firefox"],
+    },
+}
+
+def detect_browser_version(browser):
+    """
+    Returns the installed browser version (e.g. '120.0.2210.91') or None.
+    Reads the registry on Windows, otherwise asks the binary for --version.
+    """
+    import re
+    import shutil
+    import subprocess
+    import sys
+
+    source = BROWSER_VERSION_SOURCES.get(browser.lower())
+    if not source:
+        return None
+    version_pattern = re.compile(r"\d+(?:\.\d+)+")
+
+    if sys.platform == 'win32':
+        import winreg
+        key_path, value_name = source['registry']
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, key_path) as key:
+                    value, _ = winreg.QueryValueEx(key, value_name)
+            except OSError:
+                continue
+            match = version_pattern.search(str(value))
+            if match:
+                return match.group(0)
+
+    for command in source['commands']:
+        binary = shutil.which(command)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except Exception:
+            continue
+        match = version_pattern.search(output or "")
+        if match:
+            return match.group(0)
+    return None
+
+def _load_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_driver_cache(cache):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{DRIVER_CACHE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, DRIVER_CACHE_FILE)
+
+def get_cached_driver_path(browser):
+    """
+    Returns the cached driver path for this browser if it was recorded for the
+    currently installed browser version and still exists on disk, else None.
+    """
+    version = detect_browser_version(browser)
+    if not version:
+        return None
+    with _driver_cache_lock:
+        entry = _load_driver_cache().get(browser.lower())
+    if not entry or entry.get('browser_version') != version:
+        return None
+    driver_path = entry.get('driver_path')
+    if driver_path and os.path.isfile(driver_path):
+        return driver_path
+    return None
+
+def remember_driver_path(browser, driver_path):
+    """
+    Records a driver that successfully started this browser, keyed by the
+    installed browser version. A version change invalidates the entry.
+    """
+    if not driver_path or not os.path.isfile(driver_path):
+        return
+    version = detect_browser_version(browser)
+    if not version:
+        return
+    try:
+        with _driver_cache_lock:
+            cache = _load_driver_cache()
+            cache[browser.lower()] = {
+                'browser_version': version,
+                'driver_path': os.path.abspath(driver_path),
+                'recorded_at': time.time(),
+            }
+            _save_driver_cache(cache)
+    except OSError as e:
+        log.warning(f"Could not update driver cache: {e}")
+
+def forget_cached_driver(browser):
+    """
+    Drops the cache entry for a browser whose cached driver failed to start.
+    """
+    try:
+        with _driver_cache_lock:
+            cache = _load_driver_cache()
+            if cache.pop(browser.lower(), None) is not None:
+                _save_driver_cache(cache)
+    except OSError:
+        pass
+
+# Automation profiles are kept in step with the real browser profile by
+# sync_profile, which records what it last copied in this manifest
+PROFILE_SYNC_MANIFEST = ".profile_sync.json"
+CHROMIUM_PROFILE_ITEMS = ['Cookies', 'Login Data', 'Preferences', 'Network']
+FIREFOX_PROFILE_ITEMS = ['cookies.sqlite', 'key4.db', 'logins.json', 'prefs.js', 'cert9.db',
+                         'sessionstore*.js*', 'sessionstore-backups']
+
+def _expand_profile_items(root, items):
+    """Files under root matching `items` (names, glob patterns or directories)"""
+    import glob
+    files = []
+    for item in items:
+        for path in glob.glob(os.path.join(root, *item.split("/"))):
+            if os.path.isdir(path):
+                for dirpath, _, names in os.walk(path):
+                    files.extend(os.path.join(dirpath, name) for name in names)
+            else:
+                files.append(path)
+    return files
+
+def _file_digest(path):
+    import hashlib
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _clone_file(src, dst):
+    """
+    Copies src over dst atomically. Uses a reflink (copy-on-write clone) where
+    the filesystem supports it, so unchanged blocks are shared, and a regular
+    copy otherwise.
+    """
+    import shutil
+    tmp_path = f"{dst}.sync-tmp"
+    cloned = False
+    try:
+        import fcntl
+        with open(src, "rb") as s, open(tmp_path, "wb") as d:
+            fcntl.ioctl(d.fileno(), 0x40049409, s.fileno())  # FICLONE
+        cloned = True
+    except (ImportError, OSError):
+        pass
+    if not cloned:
+        shutil.copyfile(src, tmp_path)
+    shutil.copystat(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+def sync_profile(source_dir, target_dir, items, label):
+    """
+    Brings the automation profile in target_dir up to date with the files
+    (or glob patterns, or directories) `items` of the real profile in
+    source_dir, copying only files that changed since the last sync.
+
+    A file is unchanged when its size and mtime match the manifest; if only
+    those differ, its content hash decides. Files the browser changed inside
+    the automation profile are left alone unless the source changed too.
+    Returns the number of files copied.
+    """
+    manifest_path = os.path.join(target_dir, PROFILE_SYNC_MANIFEST)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    copied = 0
+    changed_manifest = False
+    for src in _expand_profile_items(source_dir, items):
+        rel = os.path.relpath(src, source_dir).replace(os.sep, "/")
+        dst = os.path.join(target_dir, *rel.split("/"))
+        try:
+            st = os.stat(src)
+            entry = manifest.get(rel)
+            if entry and os.path.exists(dst):
+                if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                    continue
+                digest = _file_digest(src)
+                if digest == entry['hash']:
+                    entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                    changed_manifest = True
+                    continue
+            else:
+                digest = _file_digest(src)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _clone_file(src, dst)
+            manifest[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest}
+            copied += 1
+            changed_manifest = True
+        except OSError as e:
+            # Usually a file locked by the running browser; try again next launch
+            log.warning(f"Could not sync {rel}: {e}")
+
+    if changed_manifest:
+        os.makedirs(target_dir, exist_ok=True)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+    if copied:
+        log.info(f"Synced {copied} changed file(s) into the {label} automation profile")
+    return copied
+
+# Profile mode 'ram' runs each browser on a throwaway copy of its automation
+# profile in RAM (see open_ram_profile); 'disk' uses the automation profile directly
+PROFILE_MODE = os.environ.get("SEARCH_AUTOMATION_PROFILE_MODE", "disk")
+RAM_PROFILE_ROOT = os.environ.get("SEARCH_AUTOMATION_RAM_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+PROFILE_CACHE_LIMIT = int(float(os.environ.get("SEARCH_AUTOMATION_PROFILE_CACHE_MB", "64")) * 1024 * 1024)
+CHROMIUM_KEEP_ITEMS = ['Local State'] + [f"Default/{item}" for item in CHROMIUM_PROFILE_ITEMS]
+CHROMIUM_CACHE_ITEMS = ['Default/Cache', 'Default/Code Cache']
+FIREFOX_KEEP_ITEMS = FIREFOX_PROFILE_ITEMS
+FIREFOX_CACHE_ITEMS = ['cache2', 'startupCache']
+
+def _copy_profile_items(source_dir, target_dir, items):
+    """Copies the files matching `items` from source_dir to target_dir; returns bytes copied"""
+    copied = 0
+    for src in _expand_profile_items(source_dir, items):
+        dst = os.path.join(target_dir, os.path.relpath(src, source_dir))
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _clone_file(src, dst)
+            copied += os.path.getsize(dst)
+        except OSError as e:
+            log.warning(f"Could not copy {os.path.relpath(src, source_dir)}: {e}")
+    return copied
+
+def prune_profile_cache(profile_dir, cache_items, limit):
+    """
+    Deletes the least recently modified cache files until the cache items
+    of profile_dir total at most `limit` bytes. Returns bytes removed.
+    """
+    files = []
+    for path in _expand_profile_items(profile_dir, cache_items):
+        try:
+            st = os.stat(path)
+            files.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            pass
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total - removed <= limit:
+            break
+        try:
+            os.remove(path)
+            removed += size
+        except OSError:
+            pass
+    return removed
+
+# RAM profiles opened by the driver build running on this thread and not yet
+# attached to its driver; build_browser_driver deletes them if the build fails
+_unattached_ram_profiles = threading.local()
+
+def open_ram_profile(profile_dir, keep_items, cache_items, label):
+    """
+    Builds a working profile in RAM (RAM_PROFILE_ROOT, /dev/shm by default)
+    from the kept state and cache of the on-disk profile_dir, which serves as
+    the seed. Returns the RAM profile path, or None to use profile_dir as is.
+    """
+    import atexit
+    import shutil
+    import tempfile
+
+    try:
+        ram_dir = tempfile.mkdtemp(prefix=f"search-automation-{label.lower()}-", dir=RAM_PROFILE_ROOT)
+    except OSError as e:
+        log.warning(f"Could not create RAM profile, using disk profile: {e}")
+        return None
+    # Removed on quit by close_ram_profile; this catches runs that never quit
+    atexit.register(shutil.rmtree, ram_dir, ignore_errors=True)
+    if getattr(_unattached_ram_profiles, 'dirs', None) is not None:
+        _unattached_ram_profiles.dirs.append(ram_dir)
+    copied = _copy_profile_items(profile_dir, ram_dir, keep_items + cache_items)
+    location = "RAM" if RAM_PROFILE_ROOT else "temp dir (set SEARCH_AUTOMATION_RAM_DIR to a RAM disk)"
+    log.info(f"Using {label} profile in {location}: {ram_dir} ({copied / 1024 / 1024:.1f} MB seeded)")
+    return ram_dir
 
-def perform_rewards_qualifying_actions(driver, search_term):
+def close_ram_profile(ram_dir, profile_dir, keep_items, cache_items, label):
     """
-    Performs specific actions that help qualify searches for Microsoft Rewards.
+    Writes the kept state (cookies, logins) of a RAM profile back to
+    profile_dir, along with its cache pruned to PROFILE_CACHE_LIMIT, then
+    deletes the RAM profile.
     """
+    import shutil
+
     try:
-        # Check for Bing rewards-related elements
-        rewards_elements = driver.find_elements(By.CSS_SELECTOR, 
-            ".rewards, .rewardsbadge, .ms-rewards, [data-testid*='reward'], .earnpoints")
-        
-        if rewards_elements:
-            print("  -> Microsoft Rewards elements detected")
-        
-        # Look for and interact with different search result types
-        # Images tab (sometimes helps with variety)
-        if random.random() < 0.2:  # 20% chance
-            try:
-                images_tab = driver.find_element(By.CSS_SELECTOR, "a[href*='images']")
-                if images_tab:
-                    print("  -> Checking images results...")
-                    human_click(driver, images_tab)
-                    time.sleep(random.uniform(2, 4))
-                    # Go back to web results
-                    web_tab = driver.find_element(By.CSS_SELECTOR, "a[href*='search'][href*='q=']")
-                    if web_tab:
-                        human_click(driver, web_tab)
-                        time.sleep(random.uniform(1, 2))
-            except Exception:
-                pass
-        
-        # Look for news results (another variety signal)
-        if random.random() < 0.2:  # 20% chance
-            try:
-                news_tab = driver.find_element(By.CSS_SELECTOR, "a[href*='news']")
-                if news_tab:
-                    print("  -> Checking news results...")
-                    human_click(driver, news_tab)
-                    time.sleep(random.uniform(2, 4))
-                    # Go back to web results
-                    web_tab = driver.find_element(By.CSS_SELECTOR, "a[href*='search'][href*='q=']")
-                    if web_tab:
-                        human_click(driver, web_tab)
-                        time.sleep(random.uniform(1, 2))
-            except Exception:
-                pass
-        
-        # Interact with search suggestions or related searches
-        try:
-            related_searches = driver.find_elements(By.CSS_SELECTOR, 
-                ".b_rs, .related-search, .suggestion, [data-testid*='suggestion']")
-            if related_searches and random.random() < 0.1:  # 10% chance
-                suggestion = random.choice(related_searches[:3])
-                print("  -> Checking related search suggestion...")
-                human_mouse_movement(driver, suggestion)
-                time.sleep(random.uniform(0.5, 1.0))
-        except Exception:
-            pass
-            
+        pruned = prune_profile_cache(ram_dir, cache_items, PROFILE_CACHE_LIMIT)
+        kept = _copy_profile_items(ram_dir, profile_dir, keep_items)
+        for item in cache_items:
+            shutil.rmtree(os.path.join(profile_dir, *item.split("/")), ignore_errors=True)
+        cached = _copy_profile_items(ram_dir, profile_dir, cache_items)
+        log.info(f"Saved {label} profile state ({kept / 1024 / 1024:.1f} MB) and cache "
+                 f"({cached / 1024 / 1024:.1f} MB, {pruned / 1024 / 1024:.1f} MB pruned)")
     except Exception as e:
-        print(f"  -> Could not perform rewards actions: {e}")
+        log.warning(f"Could not save {label} profile state: {e}")
+    finally:
+        shutil.rmtree(ram_dir, ignore_errors=True)
 
-def click_search_result(driver):
-    """
-    Occasionally clicks on search results to show genuine engagement.
-    """
+def attach_ram_profile(driver, ram_dir, profile_dir, keep_items, cache_items, label):
+    """Makes driver.quit() save and remove the RAM profile once the browser has exited"""
+    pending = getattr(_unattached_ram_profiles, 'dirs', None) or []
+    if ram_dir in pending:
+        pending.remove(ram_dir)
+    original_quit = driver.quit
+    closed = []
+
+    def quit():
+        try:
+            original_quit()
+        finally:
+            if not closed:
+                closed.append(True)
+                close_ram_profile(ram_dir, profile_dir, keep_items, cache_items, label)
+
+    driver.quit = quit
+
+# Lean mode: a page counts as loaded at DOMContentLoaded (page-load strategy
+# 'eager') and images, fonts and media are not fetched. SEARCH_AUTOMATION_LEAN
+# lists the browsers to run lean: 'all', or e.g. 'chrome,edge'.
+LEAN_BROWSERS = {b.strip().lower() for b in os.environ.get("SEARCH_AUTOMATION_LEAN", "").split(",") if b.strip()}
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.m4a",
+    "*th.bing.com/th*",  # Bing thumbnails, served without a file extension
+]
+FIREFOX_LEAN_PREFS = {
+    "permissions.default.image": 2,          # Block images
+    "gfx.downloadable_fonts.enabled": False,  # Skip web fonts
+    "media.autoplay.default": 5,             # Block all autoplay
+    "media.preload.default": 0,              # Don't preload media
+    "media.preload.auto": 0,
+}
+
+def is_lean_browser(browser):
+    return 'all' in LEAN_BROWSERS or browser.lower() in LEAN_BROWSERS
+
+def enable_lean_blocking(driver):
+    """Blocks LEAN_BLOCKED_URLS in a Chromium browser through CDP"""
     try:
-        # Find search result links (but avoid ads)
-        result_links = driver.find_elements(By.CSS_SELECTOR, 
-            "h2 a, .b_title a, .b_algo h2 a, [data-testid='result'] a")
-        
-        # Filter out ad results and keep only organic results
-        organic_results = []
-        for link in result_links[:8]:  # Only check first 8 results
-            try:
-                href = link.get_attribute('href')
-                # Skip ads, Microsoft sites, and suspicious links
-                if (href and 
-                    'bing.com/aclick' not in href and 
-                    'msn.com/aclick' not in href and
-                    len(href) > 20):
-                    organic_results.append(link)
-            except Exception:
-                continue
-        
-        if organic_results:
-            # Click on a random organic result
-            result_to_click = random.choice(organic_results[:5])  # Top 5 results only
-            print("  -> Clicking on search result for deeper engagement...")
-            
-            # Scroll to result first
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", result_to_click)
-            time.sleep(random.uniform(1, 2))
-            
-            # Human-like click
-            human_click(driver, result_to_click)
-            
-            # Stay on the page briefly (like reading)
-            time.sleep(random.uniform(3, 8))
-            
-            # Sometimes scroll on the destination page
-            if random.random() < 0.7:  # 70% chance
-                scroll_amount = random.randint(200, 600)
-                driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-                time.sleep(random.uniform(2, 4))
-            
-            # Go back to search results
-            driver.back()
-            time.sleep(random.uniform(2, 4))
-            print("  -> Returned to search results")
-            
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
     except Exception as e:
-        print(f"  -> Could not click search result: {e}")
+        log.warning(f"Could not enable resource blocking: {e}")
 
-def build_browser_driver(browser='edge', headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222):
+def build_browser_driver(browser='edge', headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222, instrument=False, lean=None):
     """
     Build a browser driver for Edge, Chrome, Brave, or Firefox.
     
     Args:
-        browser: 'edge', 'chrome', 'brave', or 'firefox'
+        browser: 'edge', 'chrome', 'brave', 'firefox', or 'fake' (in-memory
+                 FakeDriver from fake_webdriver.py, for profiling the harness)
         headless: Run browser in headless mode
         window_size: Initial window size
         use_existing: Connect to existing browser
         debug_port: Port for existing browser connection
+        instrument: Record every WebDriver command and sleep (see SessionRecorder);
+                    the recorder is available as driver._recorder
+        lean: Eager page loads with images, fonts and media blocked; defaults
+              to whether SEARCH_AUTOMATION_LEAN names this browser
     """
+    started = time.time()
     browser_lower = browser.lower()
-    if browser_lower == 'chrome':
-        return build_chrome_driver(headless, window_size, use_existing, debug_port)
-    elif browser_lower == 'brave':
-        return build_brave_driver(headless, window_size, use_existing, debug_port)
-    elif browser_lower == 'firefox':
-        return build_firefox_driver(headless, window_size, use_existing, debug_port)
-    else:
-        return build_edge_driver(headless, window_size, use_existing, debug_port)
+    if lean is None:
+        lean = is_lean_browser(browser_lower)
+    _unattached_ram_profiles.dirs = []
+    try:
+        if browser_lower == 'chrome':
+            driver = build_chrome_driver(headless, window_size, use_existing, debug_port, lean)
+        elif browser_lower == 'brave':
+            driver = build_brave_driver(headless, window_size, use_existing, debug_port, lean)
+        elif browser_lower == 'firefox':
+            driver = build_firefox_driver(headless, window_size, use_existing, debug_port, lean)
+        elif browser_lower == 'fake':
+            from fake_webdriver import FakeDriver
+            driver = FakeDriver(latency=float(os.environ.get("SEARCH_AUTOMATION_FAKE_LATENCY", "0")))
+        else:
+            driver = build_edge_driver(headless, window_size, use_existing, debug_port, lean)
+    except Exception:
+        import shutil
+
+        # The browser never started on its RAM profile; don't leave it in RAM until exit
+        for ram_dir in _unattached_ram_profiles.dirs:
+            shutil.rmtree(ram_dir, ignore_errors=True)
+        raise
+    finally:
+        _unattached_ram_profiles.dirs = None
+
+    if instrument:
+        recorder = SessionRecorder(browser_lower)
+        recorder.set_phase('launch')
+        recorder.record('launch', 'build_browser_driver', time.time() - started)
+        instrument_driver(driver, recorder)
+    return driver
 
-def build_chrome_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222):
+def build_chrome_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222, lean=False):
     """
     Build Chrome driver with human-like settings.
     Uses your existing Chrome profile to maintain Microsoft account login.
     """
     import os
-    import shutil
-    import tempfile
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
     
     options = ChromeOptions()
+    ram_profile = None
+    if lean:
+        options.page_load_strategy = 'eager'
     
     if use_existing:
         # Connect to existing Chrome browser
-        print(f"Connecting to existing Chrome browser on port {debug_port}...")
+        log.info(f"Connecting to existing Chrome browser on port {debug_port}...")
         options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
     else:
         # Use existing Chrome profile to stay logged in
@@ -486,26 +1901,20 @@ def build_chrome_driver(headless=False, window_size=(1200, 800), use_existing=Fa
         default_profile = os.path.join(original_user_data, 'Default')
         automation_default = os.path.join(automation_profile_dir, 'Default')
         
-        if os.path.exists(default_profile) and not os.path.exists(automation_default):
-            print("Copying Chrome profile for automation (one-time setup)...")
+        if os.path.exists(default_profile):
+            if not os.path.exists(automation_default):
+                log.info("Copying Chrome profile for automation (first sync)...")
             try:
-                os.makedirs(automation_profile_dir, exist_ok=True)
-                # Copy only essential files to maintain login
-                for item in ['Cookies', 'Login Data', 'Preferences', 'Network']:
-                    src = os.path.join(default_profile, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(automation_default, item)
-                        os.makedirs(automation_default, exist_ok=True)
-                        if os.path.isfile(src):
-                            shutil.copy2(src, dst)
-                        else:
-                            shutil.copytree(src, dst, dirs_exist_ok=True)
+                # Copy only essential files to maintain login, and only those that changed
+                sync_profile(default_profile, automation_default, CHROMIUM_PROFILE_ITEMS, "Chrome")
             except Exception as e:
-                print(f"Note: Could not copy profile: {e}")
-                print("Using fresh profile - please sign in to Microsoft account when browser opens")
+                log.warning(f"Could not copy profile: {e}")
+                log.warning("Using fresh profile - please sign in to Microsoft account when browser opens")
         
-        print(f"Using Chrome automation profile")
-        options.add_argument(f"--user-data-dir={automation_profile_dir}")
+        log.info(f"Using Chrome automation profile")
+        if PROFILE_MODE == 'ram':
+            ram_profile = open_ram_profile(automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Chrome")
+        options.add_argument(f"--user-data-dir={ram_profile or automation_profile_dir}")
         options.add_argument(f"--profile-directory=Default")
         
         # New browser instance with human-like settings
@@ -539,33 +1948,51 @@ def build_chrome_driver(headless=False, window_size=(1200, 800), use_existing=Fa
     # Try to get Chrome driver
     driver = None
     
-    # First try system ChromeDriver
-    try:
-        print("Trying to use system-installed ChromeDriver...")
-        driver = webdriver.Chrome(options=options)
-        print("Successfully connected using system ChromeDriver!")
-    except Exception as e1:
-        print(f"System ChromeDriver failed: {e1}")
-        
-        # If that fails, try auto-download
-        if not use_existing:
+    # Go straight to a cached driver known to work with this browser version
+    if not use_existing:
+        cached_path = get_cached_driver_path('chrome')
+        if cached_path:
             try:
-                print("Trying to auto-download ChromeDriver...")
-                service = ChromeService(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=options)
-                print("Successfully connected using downloaded ChromeDriver!")
-            except Exception as e2:
-                print(f"Auto-download ChromeDriver failed: {e2}")
-        
-        if driver is None:
-            print(f"All ChromeDriver methods failed.")
-            if use_existing:
-                print("\nTo use existing Chrome browser:")
-                print("1. Make sure Chrome is running with: chrome.exe --remote-debugging-port=9222")
-                print("2. Ensure ChromeDriver is in your system PATH")
-            else:
-                print("Please ensure Chrome is installed and ChromeDriver is available.")
-            raise Exception("Could not initialize ChromeDriver")
+                log.info(f"Using cached ChromeDriver: {cached_path}")
+                driver = webdriver.Chrome(service=ChromeService(cached_path), options=options)
+            except Exception as e0:
+                log.warning(f"Cached ChromeDriver failed: {e0}")
+                forget_cached_driver('chrome')
+
+    if driver is None:
+        # First try system ChromeDriver
+        try:
+            log.info("Trying to use system-installed ChromeDriver...")
+            driver = webdriver.Chrome(options=options)
+            if not use_existing:
+                remember_driver_path('chrome', getattr(getattr(driver, 'service', None), 'path', None))
+            log.info("Successfully connected using system ChromeDriver!")
+        except Exception as e1:
+            log.warning(f"System ChromeDriver failed: {e1}")
+        
+            # If that fails, try auto-download
+            if not use_existing:
+                try:
+                    log.info("Trying to auto-download ChromeDriver...")
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    with _driver_download_lock:
+                        driver_path = ChromeDriverManager().install()
+                    service = ChromeService(driver_path)
+                    driver = webdriver.Chrome(service=service, options=options)
+                    remember_driver_path('chrome', driver_path)
+                    log.info("Successfully connected using downloaded ChromeDriver!")
+                except Exception as e2:
+                    log.warning(f"Auto-download ChromeDriver failed: {e2}")
+        
+            if driver is None:
+                log.error(f"All ChromeDriver methods failed.")
+                if use_existing:
+                    log.error("To use existing Chrome browser:")
+                    log.error("1. Make sure Chrome is running with: chrome.exe --remote-debugging-port=9222")
+                    log.error("2. Ensure ChromeDriver is in your system PATH")
+                else:
+                    log.error("Please ensure Chrome is installed and ChromeDriver is available.")
+                raise Exception("Could not initialize ChromeDriver")
 
     # Make browser appear more human-like
     try:
@@ -601,21 +2028,32 @@ def build_chrome_driver(headless=False, window_size=(1200, 800), use_existing=Fa
         except Exception:
             pass
 
+    if lean:
+        enable_lean_blocking(driver)
+
+    if ram_profile:
+        attach_ram_profile(driver, ram_profile, automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Chrome")
+
     return driver
 
-def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222):
+def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222, lean=False):
     """
     Build Brave driver with human-like settings.
     Uses your existing Brave profile to maintain Microsoft account login.
     """
     import os
-    import shutil
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
     
     options = ChromeOptions()
+    ram_profile = None
+    if lean:
+        options.page_load_strategy = 'eager'
     
     if use_existing:
         # Connect to existing Brave browser
-        print(f"Connecting to existing Brave browser on port {debug_port}...")
+        log.info(f"Connecting to existing Brave browser on port {debug_port}...")
         options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
     else:
         # Use existing Brave profile to stay logged in
@@ -629,26 +2067,20 @@ def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=Fal
         default_profile = os.path.join(original_user_data, 'Default')
         automation_default = os.path.join(automation_profile_dir, 'Default')
         
-        if os.path.exists(default_profile) and not os.path.exists(automation_default):
-            print("Copying Brave profile for automation (one-time setup)...")
+        if os.path.exists(default_profile):
+            if not os.path.exists(automation_default):
+                log.info("Copying Brave profile for automation (first sync)...")
             try:
-                os.makedirs(automation_profile_dir, exist_ok=True)
-                # Copy only essential files to maintain login
-                for item in ['Cookies', 'Login Data', 'Preferences', 'Network']:
-                    src = os.path.join(default_profile, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(automation_default, item)
-                        os.makedirs(automation_default, exist_ok=True)
-                        if os.path.isfile(src):
-                            shutil.copy2(src, dst)
-                        else:
-                            shutil.copytree(src, dst, dirs_exist_ok=True)
+                # Copy only essential files to maintain login, and only those that changed
+                sync_profile(default_profile, automation_default, CHROMIUM_PROFILE_ITEMS, "Brave")
             except Exception as e:
-                print(f"Note: Could not copy profile: {e}")
-                print("Using fresh profile - please sign in to Microsoft account when browser opens")
+                log.warning(f"Could not copy profile: {e}")
+                log.warning("Using fresh profile - please sign in to Microsoft account when browser opens")
         
-        print(f"Using Brave automation profile")
-        options.add_argument(f"--user-data-dir={automation_profile_dir}")
+        log.info(f"Using Brave automation profile")
+        if PROFILE_MODE == 'ram':
+            ram_profile = open_ram_profile(automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Brave")
+        options.add_argument(f"--user-data-dir={ram_profile or automation_profile_dir}")
         options.add_argument(f"--profile-directory=Default")
         
         # Set Brave binary location
@@ -666,9 +2098,9 @@ def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=Fal
         
         if brave_binary:
             options.binary_location = brave_binary
-            print(f"Found Brave at: {brave_binary}")
+            log.info(f"Found Brave at: {brave_binary}")
         else:
-            print("Warning: Could not find Brave browser. Using default Chrome driver.")
+            log.warning("Could not find Brave browser. Using default Chrome driver.")
         
         # New browser instance with human-like settings
         if headless:
@@ -701,33 +2133,51 @@ def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=Fal
     # Try to get Brave driver (uses ChromeDriver)
     driver = None
     
-    # First try system ChromeDriver
-    try:
-        print("Trying to use system-installed ChromeDriver for Brave...")
-        driver = webdriver.Chrome(options=options)
-        print("Successfully connected using system ChromeDriver!")
-    except Exception as e1:
-        print(f"System ChromeDriver failed: {e1}")
-        
-        # If that fails, try auto-download
-        if not use_existing:
+    # Go straight to a cached driver known to work with this browser version
+    if not use_existing:
+        cached_path = get_cached_driver_path('brave')
+        if cached_path:
             try:
-                print("Trying to auto-download ChromeDriver for Brave...")
-                service = ChromeService(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=options)
-                print("Successfully connected using downloaded ChromeDriver!")
-            except Exception as e2:
-                print(f"Auto-download ChromeDriver failed: {e2}")
-        
-        if driver is None:
-            print(f"All ChromeDriver methods failed.")
-            if use_existing:
-                print("\nTo use existing Brave browser:")
-                print("1. Make sure Brave is running with: brave.exe --remote-debugging-port=9222")
-                print("2. Ensure ChromeDriver is in your system PATH")
-            else:
-                print("Please ensure Brave is installed and ChromeDriver is available.")
-            raise Exception("Could not initialize ChromeDriver for Brave")
+                log.info(f"Using cached ChromeDriver: {cached_path}")
+                driver = webdriver.Chrome(service=ChromeService(cached_path), options=options)
+            except Exception as e0:
+                log.warning(f"Cached ChromeDriver failed: {e0}")
+                forget_cached_driver('brave')
+
+    if driver is None:
+        # First try system ChromeDriver
+        try:
+            log.info("Trying to use system-installed ChromeDriver for Brave...")
+            driver = webdriver.Chrome(options=options)
+            if not use_existing:
+                remember_driver_path('brave', getattr(getattr(driver, 'service', None), 'path', None))
+            log.info("Successfully connected using system ChromeDriver!")
+        except Exception as e1:
+            log.warning(f"System ChromeDriver failed: {e1}")
+        
+            # If that fails, try auto-download
+            if not use_existing:
+                try:
+                    log.info("Trying to auto-download ChromeDriver for Brave...")
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    with _driver_download_lock:
+                        driver_path = ChromeDriverManager().install()
+                    service = ChromeService(driver_path)
+                    driver = webdriver.Chrome(service=service, options=options)
+                    remember_driver_path('brave', driver_path)
+                    log.info("Successfully connected using downloaded ChromeDriver!")
+                except Exception as e2:
+                    log.warning(f"Auto-download ChromeDriver failed: {e2}")
+        
+            if driver is None:
+                log.error(f"All ChromeDriver methods failed.")
+                if use_existing:
+                    log.error("To use existing Brave browser:")
+                    log.error("1. Make sure Brave is running with: brave.exe --remote-debugging-port=9222")
+                    log.error("2. Ensure ChromeDriver is in your system PATH")
+                else:
+                    log.error("Please ensure Brave is installed and ChromeDriver is available.")
+                raise Exception("Could not initialize ChromeDriver for Brave")
 
     # Make browser appear more human-like
     try:
@@ -763,22 +2213,35 @@ def build_brave_driver(headless=False, window_size=(1200, 800), use_existing=Fal
         except Exception:
             pass
 
+    if lean:
+        enable_lean_blocking(driver)
+
+    if ram_profile:
+        attach_ram_profile(driver, ram_profile, automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Brave")
+
     return driver
 
-def build_firefox_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222):
+def build_firefox_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222, lean=False):
     """
     Build Firefox driver with human-like settings.
     Uses your existing Firefox profile to maintain Microsoft account login.
     """
     import os
-    import shutil
     import glob
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
     
     options = FirefoxOptions()
+    ram_profile = None
+    if lean:
+        options.page_load_strategy = 'eager'
+        for name, value in FIREFOX_LEAN_PREFS.items():
+            options.set_preference(name, value)
     
     if use_existing:
         # Connect to existing Firefox browser
-        print(f"Connecting to existing Firefox browser on port {debug_port}...")
+        log.info(f"Connecting to existing Firefox browser on port {debug_port}...")
         options.add_argument("--marionette-port")
         options.add_argument(str(debug_port))
     else:
@@ -798,47 +2261,27 @@ def build_firefox_driver(headless=False, window_size=(1200, 800), use_existing=F
             if profiles:
                 default_profile = profiles[0]
         
-        # Check if we should copy the default profile
-        if default_profile and os.path.exists(default_profile) and not os.path.exists(automation_profile_dir):
-            print("Copying Firefox profile for automation (one-time setup)...")
+        # Keep the automation profile in step with the default profile
+        if default_profile and os.path.exists(default_profile):
+            if not os.path.exists(automation_profile_dir):
+                log.info("Copying Firefox profile for automation (first sync)...")
             try:
-                os.makedirs(automation_profile_dir, exist_ok=True)
-                # Copy essential files to maintain login
-                essential_files = ['cookies.sqlite', 'key4.db', 'logins.json', 'prefs.js', 'cert9.db']
-                for item in essential_files:
-                    src = os.path.join(default_profile, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(automation_profile_dir, item)
-                        try:
-                            shutil.copy2(src, dst)
-                        except Exception as e:
-                            print(f"Note: Could not copy {item}: {e}")
-                
-                # Copy sessionstore and other state files if they exist
-                for pattern in ['sessionstore*.js*', 'sessionstore-backups']:
-                    for src_path in glob.glob(os.path.join(default_profile, pattern)):
-                        dst_path = os.path.join(automation_profile_dir, os.path.basename(src_path))
-                        try:
-                            if os.path.isfile(src_path):
-                                shutil.copy2(src_path, dst_path)
-                            elif os.path.isdir(src_path):
-                                shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                        except Exception as e:
-                            print(f"Note: Could not copy {os.path.basename(src_path)}: {e}")
-                
-                print("Profile copied successfully!")
+                # Copy essential login and session files, and only those that changed
+                sync_profile(default_profile, automation_profile_dir, FIREFOX_PROFILE_ITEMS, "Firefox")
             except Exception as e:
-                print(f"Note: Could not copy profile: {e}")
-                print("Using fresh profile - please sign in to Microsoft account when browser opens")
+                log.warning(f"Could not copy profile: {e}")
+                log.warning("Using fresh profile - please sign in to Microsoft account when browser opens")
         elif not default_profile:
-            print("No default Firefox profile found. Using fresh profile - please sign in to Microsoft account when browser opens")
+            log.warning("No default Firefox profile found. Using fresh profile - please sign in to Microsoft account when browser opens")
             os.makedirs(automation_profile_dir, exist_ok=True)
         
-        print(f"Using Firefox automation profile")
+        log.info(f"Using Firefox automation profile")
         
         # Set the profile to use the automation directory
+        if PROFILE_MODE == 'ram':
+            ram_profile = open_ram_profile(automation_profile_dir, FIREFOX_KEEP_ITEMS, FIREFOX_CACHE_ITEMS, "Firefox")
         options.add_argument("-profile")
-        options.add_argument(automation_profile_dir)
+        options.add_argument(ram_profile or automation_profile_dir)
         
         # New browser instance with human-like settings
         if headless:
@@ -864,33 +2307,51 @@ def build_firefox_driver(headless=False, window_size=(1200, 800), use_existing=F
     # Try to get Firefox driver
     driver = None
     
-    # First try system GeckoDriver
-    try:
-        print("Trying to use system-installed GeckoDriver...")
-        driver = webdriver.Firefox(options=options)
-        print("Successfully connected using system GeckoDriver!")
-    except Exception as e1:
-        print(f"System GeckoDriver failed: {e1}")
-        
-        # If that fails, try auto-download
-        if not use_existing:
+    # Go straight to a cached driver known to work with this browser version
+    if not use_existing:
+        cached_path = get_cached_driver_path('firefox')
+        if cached_path:
             try:
-                print("Trying to auto-download GeckoDriver...")
-                service = FirefoxService(GeckoDriverManager().install())
-                driver = webdriver.Firefox(service=service, options=options)
-                print("Successfully connected using downloaded GeckoDriver!")
-            except Exception as e2:
-                print(f"Auto-download GeckoDriver failed: {e2}")
-        
-        if driver is None:
-            print(f"All GeckoDriver methods failed.")
-            if use_existing:
-                print("\nTo use existing Firefox browser:")
-                print("1. Make sure Firefox is running with remote debugging enabled")
-                print("2. Ensure GeckoDriver is in your system PATH")
-            else:
-                print("Please ensure Firefox is installed and GeckoDriver is available.")
-            raise Exception("Could not initialize GeckoDriver")
+                log.info(f"Using cached GeckoDriver: {cached_path}")
+                driver = webdriver.Firefox(service=FirefoxService(cached_path), options=options)
+            except Exception as e0:
+                log.warning(f"Cached GeckoDriver failed: {e0}")
+                forget_cached_driver('firefox')
+
+    if driver is None:
+        # First try system GeckoDriver
+        try:
+            log.info("Trying to use system-installed GeckoDriver...")
+            driver = webdriver.Firefox(options=options)
+            if not use_existing:
+                remember_driver_path('firefox', getattr(getattr(driver, 'service', None), 'path', None))
+            log.info("Successfully connected using system GeckoDriver!")
+        except Exception as e1:
+            log.warning(f"System GeckoDriver failed: {e1}")
+        
+            # If that fails, try auto-download
+            if not use_existing:
+                try:
+                    log.info("Trying to auto-download GeckoDriver...")
+                    from webdriver_manager.firefox import GeckoDriverManager
+                    with _driver_download_lock:
+                        driver_path = GeckoDriverManager().install()
+                    service = FirefoxService(driver_path)
+                    driver = webdriver.Firefox(service=service, options=options)
+                    remember_driver_path('firefox', driver_path)
+                    log.info("Successfully connected using downloaded GeckoDriver!")
+                except Exception as e2:
+                    log.warning(f"Auto-download GeckoDriver failed: {e2}")
+        
+            if driver is None:
+                log.error(f"All GeckoDriver methods failed.")
+                if use_existing:
+                    log.error("To use existing Firefox browser:")
+                    log.error("1. Make sure Firefox is running with remote debugging enabled")
+                    log.error("2. Ensure GeckoDriver is in your system PATH")
+                else:
+                    log.error("Please ensure Firefox is installed and GeckoDriver is available.")
+                raise Exception("Could not initialize GeckoDriver")
 
     # Set random position on screen
     if not use_existing and not headless:
@@ -906,17 +2367,25 @@ def build_firefox_driver(headless=False, window_size=(1200, 800), use_existing=F
         except Exception:
             pass
 
+    if ram_profile:
+        attach_ram_profile(driver, ram_profile, automation_profile_dir, FIREFOX_KEEP_ITEMS, FIREFOX_CACHE_ITEMS, "Firefox")
+
     return driver
 
-def build_edge_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222):
+def build_edge_driver(headless=False, window_size=(1200, 800), use_existing=False, debug_port=9222, lean=False):
     import os
-    import shutil
+    from selenium import webdriver
+    from selenium.webdriver.edge.service import Service as EdgeService
+    from selenium.webdriver.edge.options import Options as EdgeOptions
     
     options = EdgeOptions()
+    ram_profile = None
+    if lean:
+        options.page_load_strategy = 'eager'
     
     if use_existing:
         # Connect to existing Edge browser - use minimal options for maximum compatibility
-        print(f"Connecting to existing Edge browser on port {debug_port}...")
+        log.info(f"Connecting to existing Edge browser on port {debug_port}...")
         options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
     else:
         # Use existing Edge profile to stay logged in
@@ -930,26 +2399,20 @@ def build_edge_driver(headless=False, window_size=(1200, 800), use_existing=Fals
         default_profile = os.path.join(original_user_data, 'Default')
         automation_default = os.path.join(automation_profile_dir, 'Default')
         
-        if os.path.exists(default_profile) and not os.path.exists(automation_default):
-            print("Copying Edge profile for automation (one-time setup)...")
+        if os.path.exists(default_profile):
+            if not os.path.exists(automation_default):
+                log.info("Copying Edge profile for automation (first sync)...")
             try:
-                os.makedirs(automation_profile_dir, exist_ok=True)
-                # Copy only essential files to maintain login
-                for item in ['Cookies', 'Login Data', 'Preferences', 'Network']:
-                    src = os.path.join(default_profile, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(automation_default, item)
-                        os.makedirs(automation_default, exist_ok=True)
-                        if os.path.isfile(src):
-                            shutil.copy2(src, dst)
-                        else:
-                            shutil.copytree(src, dst, dirs_exist_ok=True)
+                # Copy only essential files to maintain login, and only those that changed
+                sync_profile(default_profile, automation_default, CHROMIUM_PROFILE_ITEMS, "Edge")
             except Exception as e:
-                print(f"Note: Could not copy profile: {e}")
-                print("Using fresh profile - please sign in to Microsoft account when browser opens")
+                log.warning(f"Could not copy profile: {e}")
+                log.warning("Using fresh profile - please sign in to Microsoft account when browser opens")
         
-        print(f"Using Edge automation profile")
-        options.add_argument(f"--user-data-dir={automation_profile_dir}")
+        log.info(f"Using Edge automation profile")
+        if PROFILE_MODE == 'ram':
+            ram_profile = open_ram_profile(automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Edge")
+        options.add_argument(f"--user-data-dir={ram_profile or automation_profile_dir}")
         options.add_argument(f"--profile-directory=Default")
         
         # New browser instance with human-like settings
@@ -983,35 +2446,53 @@ def build_edge_driver(headless=False, window_size=(1200, 800), use_existing=Fals
     # Try to get Edge driver with better error handling
     driver = None
     
-    # First try system EdgeDriver (more reliable for existing browser connections)
-    try:
-        print("Trying to use system-installed EdgeDriver...")
-        driver = webdriver.Edge(options=options)
-        print("Successfully connected using system EdgeDriver!")
-    except Exception as e1:
-        print(f"System EdgeDriver failed: {e1}")
-        
-        # If that fails, try auto-download (but skip if connecting to existing browser)
-        if not use_existing:
+    # Go straight to a cached driver known to work with this browser version
+    if not use_existing:
+        cached_path = get_cached_driver_path('edge')
+        if cached_path:
             try:
-                print("Trying to auto-download EdgeDriver...")
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                driver = webdriver.Edge(service=service, options=options)
-                print("Successfully connected using downloaded EdgeDriver!")
-            except Exception as e2:
-                print(f"Auto-download EdgeDriver failed: {e2}")
-        
-        if driver is None:
-            print(f"All EdgeDriver methods failed.")
-            if use_existing:
-                print("\nTo use existing Edge browser:")
-                print("1. Make sure Edge is running with: msedge.exe --remote-debugging-port=9222")
-                print("2. Ensure EdgeDriver is in your system PATH")
-                print("3. Download EdgeDriver from: https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/")
-            else:
-                print("Please ensure Microsoft Edge WebDriver is installed or available in PATH.")
-                print("You can download it from: https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/")
-            raise Exception("Could not initialize EdgeDriver")
+                log.info(f"Using cached EdgeDriver: {cached_path}")
+                driver = webdriver.Edge(service=EdgeService(cached_path), options=options)
+            except Exception as e0:
+                log.warning(f"Cached EdgeDriver failed: {e0}")
+                forget_cached_driver('edge')
+
+    if driver is None:
+        # First try system EdgeDriver (more reliable for existing browser connections)
+        try:
+            log.info("Trying to use system-installed EdgeDriver...")
+            driver = webdriver.Edge(options=options)
+            if not use_existing:
+                remember_driver_path('edge', getattr(getattr(driver, 'service', None), 'path', None))
+            log.info("Successfully connected using system EdgeDriver!")
+        except Exception as e1:
+            log.warning(f"System EdgeDriver failed: {e1}")
+        
+            # If that fails, try auto-download (but skip if connecting to existing browser)
+            if not use_existing:
+                try:
+                    log.info("Trying to auto-download EdgeDriver...")
+                    from webdriver_manager.microsoft import EdgeChromiumDriverManager
+                    with _driver_download_lock:
+                        driver_path = EdgeChromiumDriverManager().install()
+                    service = EdgeService(driver_path)
+                    driver = webdriver.Edge(service=service, options=options)
+                    remember_driver_path('edge', driver_path)
+                    log.info("Successfully connected using downloaded EdgeDriver!")
+                except Exception as e2:
+                    log.warning(f"Auto-download EdgeDriver failed: {e2}")
+        
+            if driver is None:
+                log.error(f"All EdgeDriver methods failed.")
+                if use_existing:
+                    log.error("To use existing Edge browser:")
+                    log.error("1. Make sure Edge is running with: msedge.exe --remote-debugging-port=9222")
+                    log.error("2. Ensure EdgeDriver is in your system PATH")
+                    log.error("3. Download EdgeDriver from: https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/")
+                else:
+                    log.error("Please ensure Microsoft Edge WebDriver is installed or available in PATH.")
+                    log.error("You can download it from: https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/")
+                raise Exception("Could not initialize EdgeDriver")
 
     # Make browser appear more human-like
     try:
@@ -1049,72 +2530,77 @@ def build_edge_driver(headless=False, window_size=(1200, 800), use_existing=Fals
         except Exception:
             pass
 
+    if lean:
+        enable_lean_blocking(driver)
+
+    if ram_profile:
+        attach_ram_profile(driver, ram_profile, automation_profile_dir, CHROMIUM_KEEP_ITEMS, CHROMIUM_CACHE_ITEMS, "Edge")
+
     return driver
 
 def human_scroll(driver, min_steps=4, max_steps=8, min_pause=0.6, max_pause=1.6):
     """
     Scroll in several randomized steps to simulate human reading/scrolling.
     """
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.keys import Keys
+
     try:
-        page_height = driver.execute_script("return document.body.scrollHeight")
+        plan = []
         steps = random.randint(min_steps, max_steps)
-        scroll_so_far = 0
+        scroll_so_far = 0.0  # fraction of page height; the page stops at the bottom
         for _ in range(steps):
-            remaining = page_height - scroll_so_far
-            if remaining <= 0:
-                break
-            fraction = random.uniform(0.12, 0.35)
-            move = int(page_height * fraction)
-            scroll_so_far += move
-            if scroll_so_far > page_height:
-                scroll_so_far = page_height
-            driver.execute_script(f"window.scrollTo(0, {scroll_so_far});")
-            time.sleep(random.uniform(min_pause, max_pause))
+            scroll_so_far = min(1.0, scroll_so_far + random.uniform(0.12, 0.35))
+            plan.append(('fraction', scroll_so_far, random.uniform(min_pause, max_pause)))
 
         # small back-and-forth movement occasionally
         if random.random() < 0.4:
-            driver.execute_script("window.scrollBy(0, -120);")
-            time.sleep(random.uniform(0.3, 0.9))
-            driver.execute_script("window.scrollBy(0, 80);")
+            plan.append(('by', -120, random.uniform(0.3, 0.9)))
+            plan.append(('by', 80, 0))
+
+        run_scroll_plan(driver, plan)
     except Exception:
         # Fallback: page-down key presses
         for _ in range(random.randint(2, 6)):
             try:
                 ActionChains(driver).send_keys(Keys.PAGE_DOWN).perform()
-                time.sleep(random.uniform(0.5, 1.0))
+                _sleep(random.uniform(0.5, 1.0))
             except Exception:
                 break
 
-def ensure_microsoft_account_login(driver):
+def ensure_microsoft_account_login(driver, snapshot=None):
     """
     Checks if user is logged into Microsoft account for rewards.
     """
     try:
+        if snapshot is None:
+            snapshot = snapshot_page(driver)
         # Check if already logged in by looking for profile/account elements
-        profile_elements = driver.find_elements(By.CSS_SELECTOR, "[data-testid='profile-button'], .id_button, .profile, [aria-label*='Account'], .me-control")
+        profile_elements = snapshot['account_indicators']
         if profile_elements:
-            print("  -> Microsoft account detected - rewards should be active")
+            log.debug("Microsoft account detected - rewards should be active")
             return True
         else:
-            print("  -> No Microsoft account detected")
-            print("  -> Please manually sign into your Microsoft account in this browser")
-            print("  -> Then restart the automation for reward points to count")
+            log.warning("No Microsoft account detected")
+            log.warning("Please manually sign into your Microsoft account in this browser")
+            log.warning("Then restart the automation for reward points to count")
             return False
     except Exception:
-        print("  -> Could not verify Microsoft account status")
+        log.warning("Could not verify Microsoft account status")
         return False
 
-def ensure_rewards_eligible_behavior(driver):
+def ensure_rewards_eligible_behavior(driver, snapshot=None):
     """
     Performs additional actions to ensure searches qualify for Microsoft Rewards.
     """
     try:
         # Check for and interact with Bing homepage elements (shows engagement)
-        time.sleep(random.uniform(2, 4))
+        _sleep(random.uniform(2, 4))
         
         # Look for news, images, or other Bing features to interact with
-        interactive_elements = driver.find_elements(By.CSS_SELECTOR, 
-            ".hp_sw_logo, .hp_sw, .b_searchbox, .news, .trending, .hp_bottom")
+        if snapshot is None:
+            snapshot = snapshot_page(driver)
+        interactive_elements = snapshot['homepage_elements']
         
         if interactive_elements:
             # Occasionally interact with homepage elements (like a curious user)
@@ -1122,72 +2608,350 @@ def ensure_rewards_eligible_behavior(driver):
                 element = random.choice(interactive_elements[:3])  # Only first 3 to be safe
                 try:
                     human_mouse_movement(driver, element)
-                    time.sleep(random.uniform(0.5, 1.0))
-                    print("  -> Engaging with Bing homepage content...")
+                    _sleep(random.uniform(0.5, 1.0))
+                    log.debug("Engaging with Bing homepage content...")
                 except Exception:
                     pass
         
         # Scroll slightly on homepage (shows engagement)
         if random.random() < 0.5:  # 50% chance
             scroll_amount = random.randint(100, 300)
-            driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-            time.sleep(random.uniform(1, 2))
-            driver.execute_script("window.scrollTo(0, 0);")  # Back to top
+            run_scroll_plan(driver, [
+                ('by', scroll_amount, random.uniform(1, 2)),
+                ('to', 0, 0),  # Back to top
+            ])
             
     except Exception as e:
-        print(f"  -> Could not perform engagement actions: {e}")
+        log.warning(f"Could not perform engagement actions: {e}")
+
+class _SessionLost(Exception):
+    """The browser stopped answering (window closed or crashed)"""
+
+# Progress of each browser's search sequence, for resuming after a crash
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")
+MAX_SESSION_RECOVERIES = int(os.environ.get("SEARCH_AUTOMATION_MAX_RECOVERIES", "2"))
+
+def _checkpoint_path(browser):
+    return os.path.join(CHECKPOINT_DIR, f"{browser.lower()}.json")
 
-def run_search_sequence(topics, browser='edge', headless=False, min_wait=50, max_wait=55, use_existing=False):
-    driver = build_browser_driver(browser=browser, headless=headless, use_existing=use_existing)
+def load_checkpoint(browser):
+    """The unfinished run saved for this browser, or None"""
     try:
-        # Navigate to Bing and check for Microsoft account
-        print(f"Initializing Bing in {browser.upper()} and checking Microsoft Rewards eligibility...")
-        driver.get("https://www.bing.com")
-        time.sleep(random.uniform(3, 5))  # Extra time for page load
-        
-        # Check Microsoft account status
-        is_logged_in = ensure_microsoft_account_login(driver)
-        
-        # Attempt to close common consent dialogs (best-effort)
+        with open(_checkpoint_path(browser), encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get('next_index', 0) >= len(checkpoint.get('topics', [])):
+        return None
+    return checkpoint
+
+def save_checkpoint(browser, topics, next_index, completed):
+    """Records that topics[:next_index] have been searched (atomically)"""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = _checkpoint_path(browser)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({'browser': browser, 'topics': list(topics), 'next_index': next_index,
+                   'completed': completed, 'updated_at': time.time()}, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint(browser):
+    try:
+        os.remove(_checkpoint_path(browser))
+    except OSError:
+        pass
+
+class TopicQueue:
+    """
+    Topics shared by several browser sessions, each pulling the next one when
+    it is ready, so faster sessions do more of the work. A topic a session
+    claimed but did not finish (its browser died, or gave up) goes back to the
+    front of the queue for the others. `quotas` optionally caps how many topics
+    a browser may search ({browser: n}, with `default_quota` for the rest).
+
+    With `checkpoint_name`, the unfinished topics are saved under
+    CHECKPOINT_DIR after every change; TopicQueue.resume picks them up again.
+    """
+
+    def __init__(self, topics, quotas=None, default_quota=None, checkpoint_name=None):
+        from collections import deque
+
+        self._pending = deque(topics)
+        self._claimed = {}  # browser -> topics in flight
+        self._done = {}     # browser -> topics finished
+        self._quotas = dict(quotas or {})
+        self._default_quota = default_quota
+        self._checkpoint_name = checkpoint_name
+        self._condition = threading.Condition()
+        self._save()
+
+    @classmethod
+    def resume(cls, checkpoint_name, quotas=None, default_quota=None):
+        """The queue left unfinished under checkpoint_name, or None"""
+        checkpoint = load_checkpoint(checkpoint_name)
+        if not checkpoint:
+            return None
+        return cls(checkpoint['topics'][checkpoint['next_index']:], quotas, default_quota, checkpoint_name)
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending) + sum(len(t) for t in self._claimed.values())
+
+    def pending(self):
+        """Topics not yet claimed by any session"""
+        with self._condition:
+            return len(self._pending)
+
+    def searched(self, browser):
+        with self._condition:
+            return len(self._done.get(browser, []))
+
+    def _quota_left(self, browser):
+        quota = self._quotas.get(browser, self._default_quota)
+        if quota is None:
+            return True
+        return len(self._done.get(browser, [])) + len(self._claimed.get(browser, [])) < quota
+
+    def claim(self, browser, wait=True):
+        """
+        The next topic for `browser`, or None once it has reached its quota or
+        no topics are left. While the queue is empty but other sessions still
+        have topics in flight, waits (unless `wait` is false) in case one of
+        them is handed back.
+        """
+        with self._condition:
+            while True:
+                if not self._quota_left(browser):
+                    return None
+                if self._pending:
+                    topic = self._pending.popleft()
+                    self._claimed.setdefault(browser, []).append(topic)
+                    return topic
+                in_flight_elsewhere = any(t for b, t in self._claimed.items() if b != browser)
+                if not wait or not in_flight_elsewhere:
+                    return None
+                self._condition.wait()
+
+    def complete(self, browser, topic):
+        with self._condition:
+            self._claimed.get(browser, []).remove(topic)
+            self._done.setdefault(browser, []).append(topic)
+            self._save()
+            self._condition.notify_all()
+
+    def release(self, browser, topic=None):
+        """Puts `topic` (default: every topic `browser` has in flight) back at the front"""
+        with self._condition:
+            claimed = self._claimed.get(browser, [])
+            returned = [topic] if topic is not None else list(claimed)
+            for t in returned:
+                claimed.remove(t)
+            self._pending.extendleft(reversed(returned))
+            if returned and topic is None:
+                log.info(f"Returned {len(returned)} unfinished topic(s) from {browser.upper()} to the queue")
+            self._save()
+            self._condition.notify_all()
+
+    def _save(self):
+        # Called with the lock held
+        if not self._checkpoint_name:
+            return
+        unfinished = [t for topics in self._claimed.values() for t in topics] + list(self._pending)
         try:
-            buttons = driver.find_elements(By.TAG_NAME, "button")
-            for b in buttons[:12]:
-                txt = (b.text or "").lower()
-                if any(k in txt for k in ["accept", "agree", "i agree", "all", "consent", "yes", "allow"]):
-                    try:
-                        human_click(driver, b)
-                        time.sleep(2.0)
-                        break
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-        
-        # Perform pre-search engagement
-        ensure_rewards_eligible_behavior(driver)
+            if unfinished:
+                done = [t for topics in self._done.values() for t in topics]
+                save_checkpoint(self._checkpoint_name, unfinished, 0, done)
+            else:
+                clear_checkpoint(self._checkpoint_name)
+        except OSError as e:
+            log.warning(f"Could not save queue checkpoint: {e}")
+
+def relaunch_driver(driver, browser, headless=False, use_existing=False):
+    """
+    Quits a driver whose session was lost and returns a fresh one on the Bing
+    homepage, still reporting to the old driver's recorder if it had one.
+    """
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    recorder = getattr(driver, '_recorder', None)
+    new_driver = build_browser_driver(browser=browser, headless=headless, use_existing=use_existing)
+    if recorder is not None:
+        instrument_driver(new_driver, recorder)
+    new_driver.get(BING_URL)
+    wait_for_page_ready(new_driver, 'search_box', timeout=10)
+    return new_driver
+
+def warm_up_bing(driver, browser, readiness_log=None):
+    """
+    Session warm-up before the first search: loads the Bing homepage, checks
+    the Microsoft account, dismisses consent dialogs and does some pre-search
+    engagement. Needed once per browser session, not once per run.
+    """
+    # Navigate to Bing and check for Microsoft account
+    log.info(f"Initializing Bing in {browser.upper()} and checking Microsoft Rewards eligibility...")
+    set_phase('homepage')
+    driver.get(BING_URL)
+    wait_for_page_ready(driver, 'search_box', timeout=10, replaces=(3, 5),
+                        readiness_log=readiness_log, label='homepage')
+    try:
+        snapshot = snapshot_page(driver)
+    except Exception:
+        snapshot = None
+    
+    # Check Microsoft account status
+    ensure_microsoft_account_login(driver, snapshot)
+    
+    # Attempt to close common consent dialogs (best-effort)
+    try:
+        for button in (snapshot or snapshot_page(driver))['consent_buttons']:
+            txt = button['text'].lower()
+            if any(k in txt for k in ["accept", "agree", "i agree", "all", "consent", "yes", "allow"]):
+                try:
+                    human_click(driver, button['element'])
+                    _sleep(2.0)
+                    snapshot = None  # the dialog is gone; take a fresh look
+                    break
+                except Exception:
+                    pass
+    except Exception:
+        pass
+    
+    # Perform pre-search engagement
+    ensure_rewards_eligible_behavior(driver, snapshot)
+
+def run_search_sequence(topics, browser='edge', headless=False, min_wait=50, max_wait=55, use_existing=False, instrument=None, driver=None, checkpoint=True, warm_up=True):
+    """
+    Runs the search loop in one browser. `topics` may be a list or a
+    zero-argument callable returning one; a callable is only resolved once
+    the browser is up, so topic sourcing can overlap with browser launch.
+    With `instrument` (default: SEARCH_AUTOMATION_INSTRUMENT=1) every driver
+    command and sleep is traced and a per-phase breakdown is printed at the end.
+
+    Returns one dict per attempted search: index, topic, started/ended
+    (epoch seconds, excluding the wait before the next search), outcome
+    ('success', 'direct_url', 'engagement_failed', 'error' or
+    'disconnected'), error_type/error, time_to_results and engagement_time.
+
+    If `driver` is given it is used as-is and left open for the caller
+    (along with its recorder, if instrumented); otherwise one is built and
+    quit at the end, and rebuilt (up to MAX_SESSION_RECOVERIES times) if the
+    browser session is lost, retrying the search that failed.
+    Pass warm_up=False for a `driver` that warm_up_bing() already ran on.
+
+    With `checkpoint`, progress is saved under CHECKPOINT_DIR after every
+    search. If a previous run for this browser did not finish, its remaining
+    topics are searched instead of `topics`.
+    """
+    steps = _search_steps(topics, browser, headless, min_wait, max_wait, use_existing, instrument, driver, checkpoint, warm_up)
+    try:
+        while True:
+            try:
+                seconds = next(steps)
+            except StopIteration as done:
+                return done.value
+            _sleep(seconds)
+    finally:
+        steps.close()  # on an interrupted wait, still quit the browser and save progress
+
+def _search_steps(topics, browser, headless, min_wait, max_wait, use_existing, instrument, driver, checkpoint, warm_up):
+    """
+    The search loop behind run_search_sequence and run_search_sequence_async.
+    Each inter-search wait is yielded (intended seconds) for the caller to
+    sleep or await; the per-search results are the generator's return value.
+    """
+    if instrument is None:
+        instrument = INSTRUMENT_DEFAULT
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-        for idx, topic in enumerate(topics, 1):
-            print(f"[{idx}/{len(topics)}] Searching: {topic}")
+    log_context(browser=browser, session=_new_session_id(browser), search=None)
+    set_phase('launch')
+    owns_driver = driver is None
+    if owns_driver:
+        driver = build_browser_driver(browser=browser, headless=headless, use_existing=use_existing, instrument=instrument)
+    readiness_report = []  # (search index, topic, readiness waits)
+    search_results = []
+    completed_topics = []
+    work_queue = None
+    resumed = None
+    recoveries = 0
+    finished = False
+
+    def record_progress(next_index, topic, ok):
+        if work_queue is not None:
+            work_queue.complete(browser, topic)
+            return
+        if ok:
+            completed_topics.append(topic)
+        if checkpoint:
+            try:
+                save_checkpoint(browser, topics, next_index, completed_topics)
+            except OSError as e:
+                log.warning(f"Could not save checkpoint: {e}")
+
+    try:
+        if warm_up:
+            startup_readiness = []
+            readiness_report.append((0, 'homepage', startup_readiness))
+            warm_up_bing(driver, browser, readiness_log=startup_readiness)
+
+        if callable(topics):
+            topics = topics()
+        if isinstance(topics, TopicQueue):
+            work_queue = topics  # progress is tracked (and checkpointed) by the queue
+        elif checkpoint:
+            resumed = load_checkpoint(browser)
+            if resumed:
+                topics, completed_topics = resumed['topics'], resumed['completed']
+                log.info(f"Resuming unfinished {browser.upper()} run at search {resumed['next_index'] + 1}/{len(topics)} "
+                         f"(checkpoint from {time.strftime('%H:%M:%S', time.localtime(resumed['updated_at']))})")
+
+        idx = resumed['next_index'] if resumed else 0
+        while True:
+            if work_queue is not None:
+                topic = work_queue.claim(browser)
+            else:
+                topic = topics[idx] if idx < len(topics) else None
+            if topic is None:
+                finished = True
+                break
+            idx += 1
+            log_context(search=idx)
+            progress = f"{idx}/{len(topics)}" if work_queue is None else f"{idx}, {work_queue.pending()} queued"
+            log.info(f"[{progress}] Searching: {topic}")
+            readiness_log = []
+            readiness_report.append((idx, topic, readiness_log))
+            set_phase('homepage')
+            result = {'index': idx, 'topic': topic, 'started': time.time(), 'ended': None,
+                      'outcome': 'success', 'error_type': None, 'error': None,
+                      'time_to_results': None, 'engagement_time': None}
+            search_results.append(result)
             try:
                 # Check if browser is still connected
                 try:
                     driver.current_url  # Test connection
-                except Exception:
-                    print(f"  -> Browser disconnected! Skipping remaining searches.")
-                    print("  -> This happens when the browser window is closed manually.")
-                    break
+                except Exception as e:
+                    log.warning(f"Browser disconnected!")
+                    log.warning("This happens when the browser window is closed manually.")
+                    result.update(outcome='disconnected', error_type=type(e).__name__,
+                                  error=str(e), ended=time.time())
+                    raise _SessionLost() from e
                 
                 # Navigate to search page like a human would
                 if idx == 1:
                     # First search - go to Bing homepage first
-                    print("  -> Navigating to Bing...")
-                    driver.get("https://www.bing.com")
+                    log.debug("Navigating to Bing...")
+                    driver.get(BING_URL)
                     random_human_pause()
                 else:
                     # Subsequent searches - use search box or go to new page
                     if random.choice([True, False]):
                         # Sometimes go to fresh Bing page
-                        driver.get("https://www.bing.com")
+                        driver.get(BING_URL)
                         random_human_pause()
                 
                 # Wait for page to load completely
@@ -1196,15 +2960,24 @@ def run_search_sequence(topics, browser='edge', headless=False, min_wait=50, max
                     search_box = wait.until(EC.presence_of_element_located((By.NAME, "q")))
                 except Exception:
                     # Fallback to direct URL if search box not found
+                    set_phase('results')
                     q = urllib.parse.quote_plus(topic)
-                    search_url = f"https://www.bing.com/search?q={q}"
+                    search_url = f"{BING_URL}/search?q={q}"
                     driver.get(search_url)
-                    time.sleep(random.uniform(2.0, 4.0))
+                    wait_for_page_ready(driver, 'results', timeout=15, replaces=(2.0, 4.0),
+                                        readiness_log=readiness_log, label='results (direct URL)')
+                    result.update(outcome='direct_url', time_to_results=time.time() - result['started'])
+                    set_phase('engagement')
+                    engagement_started = time.time()
                     human_scroll(driver)
+                    result.update(engagement_time=time.time() - engagement_started, ended=time.time())
+                    METRICS.record_search(browser, result)
+                    record_progress(idx, topic, True)
                     continue
                 
                 # Human-like interaction with search box
-                print(f"  -> Typing search query...")
+                log.debug(f"Typing search query...")
+                set_phase('typing')
                 
                 # Click on search box with human-like mouse movement
                 human_click(driver, search_box)
@@ -1214,21 +2987,30 @@ def run_search_sequence(topics, browser='edge', headless=False, min_wait=50, max
                 human_type(search_box, topic)
                 
                 # Random pause before pressing enter (like humans thinking)
-                time.sleep(random.uniform(0.5, 1.5))
+                _sleep(random.uniform(0.5, 1.5))
                 
-                # Press Enter to search
+                # Press Enter to search (marking the current page first, as
+                # it may already be a results page)
+                driver.execute_script(NAVIGATION_MARK_SCRIPT)
                 search_box.send_keys(Keys.RETURN)
                 
-                # Wait for results to load completely
-                time.sleep(random.uniform(3.0, 5.0))  # Longer wait for full page load
+                # Wait for the new results to load (returns as soon as they are there)
+                set_phase('results')
+                wait_for_page_ready(driver, 'new_results', timeout=15, replaces=(3.0, 5.0),
+                                    readiness_log=readiness_log, label='results')
+                result['time_to_results'] = time.time() - result['started']
                 
                 # Verify page loaded and simulate human reading behavior
                 try:
                     driver.title  # Test that page is accessible
-                    print(f"  -> Engaging with search results...")
+                    log.debug(f"Engaging with search results...")
+                    set_phase('engagement')
+                    engagement_started = time.time()
                     
                     # Enhanced result interaction for Microsoft Rewards
-                    perform_rewards_qualifying_actions(driver, topic)
+                    snapshot = snapshot_page(driver)
+                    if perform_rewards_qualifying_actions(driver, topic, snapshot):
+                        snapshot = None
                     
                     # Simulate human reading and scrolling behavior
                     simulate_reading_behavior(driver)
@@ -1238,39 +3020,138 @@ def run_search_sequence(topics, browser='edge', headless=False, min_wait=50, max
                     
                     # Sometimes click on search result links (major engagement signal)
                     if random.random() < 0.4:  # 40% chance
-                        click_search_result(driver)
+                        click_search_result(driver, readiness_log=readiness_log, snapshot=snapshot)
                     
-                    print(f"  -> Successfully searched: {topic}")
+                    result['engagement_time'] = time.time() - engagement_started
+                    log.debug(f"Successfully searched: {topic}")
                     
                 except Exception as scroll_error:
-                    print(f"  -> Could not interact with page for '{topic}': {scroll_error}")
+                    log.warning(f"Could not interact with page for '{topic}': {scroll_error}")
+                    result.update(outcome='engagement_failed', error_type=type(scroll_error).__name__,
+                                  error=str(scroll_error))
                     
             except Exception as e:
-                print(f"  -> Error searching '{topic}': {e}")
-                # If it's a session error, break the loop
-                if "invalid session id" in str(e) or "no such window" in str(e):
-                    print("  -> Browser session lost. Stopping automation.")
-                    break
+                if not isinstance(e, _SessionLost):
+                    log.warning(f"Error searching '{topic}': {e}")
+                    result.update(outcome='error', error_type=type(e).__name__, error=str(e), ended=time.time())
+                # On a session error, relaunch the browser and retry this search
+                if isinstance(e, _SessionLost) or "invalid session id" in str(e) or "no such window" in str(e):
+                    METRICS.record_search(browser, result)
+                    if not owns_driver or use_existing or recoveries >= MAX_SESSION_RECOVERIES:
+                        log.warning("Browser session lost. Stopping automation (progress is checkpointed).")
+                        break
+                    recoveries += 1
+                    log.warning(f"Browser session lost. Relaunching {browser.upper()} "
+                                f"({recoveries}/{MAX_SESSION_RECOVERIES}) and retrying this search...")
+                    try:
+                        set_phase('launch')
+                        driver = relaunch_driver(driver, browser, headless, use_existing)
+                        log_context(session=_new_session_id(browser))
+                        METRICS.record_restart(browser)
+                    except Exception as relaunch_error:
+                        log.warning(f"Could not relaunch browser: {relaunch_error}")
+                        break
+                    if work_queue is not None:
+                        work_queue.release(browser, topic)
+                    idx -= 1
+                    continue
+
+            if result['ended'] is None:
+                result['ended'] = time.time()
+            METRICS.record_search(browser, result)
+            record_progress(idx, topic, result['outcome'] in ('success', 'direct_url'))
+
+            if readiness_log:
+                waited, saved = summarize_readiness(readiness_log)
+                log.debug(f"Page readiness: waited {waited:.1f}s, saved {saved:.1f}s vs fixed sleeps")
 
             # Human-like wait time with some variation
+            set_phase('inter-search wait')
             base_wait = random.uniform(min_wait, max_wait)
             # Add occasional longer pauses (like humans getting distracted)
-            if random.random() < 0.1:  # 10% chance of longer pause
-                extra_wait = random.uniform(10, 30)
-                print(f"  -> Taking a longer break ({extra_wait:.1f}s additional)...")
-                time.sleep(extra_wait)
+            extra_wait = random.uniform(10, 30) if random.random() < 0.1 else 0.0  # 10% chance of longer pause
+            METRICS.set_next_search(browser, CLOCK.scale(base_wait + extra_wait))
+            if extra_wait:
+                log.debug(f"Taking a longer break ({extra_wait:.1f}s additional)...")
+                yield extra_wait
             
             wait_time = base_wait
-            print(f"  -> Waiting {wait_time:.1f}s before next search...")
-            time.sleep(wait_time)
+            log.debug(f"Waiting {wait_time:.1f}s before next search...")
+            yield wait_time
 
     finally:
-        print("All searches finished. Closing browser.")
-        driver.quit()
+        set_phase('finished')
+        if work_queue is not None:
+            work_queue.release(browser)  # hand unfinished topics to the other sessions
+        elif checkpoint and finished:
+            clear_checkpoint(browser)
+        print_readiness_report(readiness_report)
+        if owns_driver:
+            log.info("All searches finished. Closing browser.")
+            try:
+                driver.quit()
+            except Exception as e:
+                log.warning(f"Browser did not quit cleanly: {e}")
+            recorder = getattr(driver, '_recorder', None)
+            if recorder is not None:
+                recorder.close()
+                flush_logs()
+                recorder.print_summary()
+                _instrumentation.recorder = None
+
+    return search_results
+
+# Async backend: pool shared by every session's blocking Selenium steps
+ASYNC_WORKERS = int(os.environ.get("SEARCH_AUTOMATION_ASYNC_WORKERS", "4"))
+
+def _advance(steps):
+    """Runs the search loop to its next wait; returns (done, seconds or results)"""
+    try:
+        return False, next(steps)
+    except StopIteration as done:
+        return True, done.value
+
+async def run_search_sequence_async(topics, browser='edge', headless=False, min_wait=50, max_wait=55,
+                                    use_existing=False, driver=None, checkpoint=True, warm_up=True, executor=None):
+    """
+    Coroutine version of run_search_sequence (same arguments and results) for
+    running many sessions on one event loop. The waits between searches are
+    awaited, so a session holds no thread while it waits; each search itself
+    - blocking Selenium calls and in-page pauses - runs on `executor` (default:
+    the loop's), which sessions share. Cancelling the task stops the session
+    once its current search finishes, quitting the browser and keeping the
+    checkpoint as on an interrupted run. Instrumentation is thread-based and
+    not available here.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    steps = _search_steps(topics, browser, headless, min_wait, max_wait, use_existing, False, driver, checkpoint, warm_up)
+    # Pool threads are shared, so the session's log context travels with its steps
+    context = contextvars.copy_context()
+    step = None
+    try:
+        while True:
+            step = loop.run_in_executor(executor, context.run, _advance, steps)
+            # Shielded: the search runs to completion even if the session is cancelled
+            done, value = await asyncio.shield(step)
+            if done:
+                return value
+            await CLOCK.wait(value)
+    finally:
+        if step is not None and not step.done():
+            try:
+                await step
+            except BaseException:
+                pass
+        await loop.run_in_executor(executor, context.run, steps.close)
 
 if __name__ == "__main__":
     import sys
     
+    configure_logging(sys.argv[sys.argv.index("--log-level") + 1] if "--log-level" in sys.argv else None,
+                      'json' if "--log-json" in sys.argv else None)
+    
     # Default settings (optimized for Microsoft Rewards)
     HEADLESS = False
     USE_EXISTING = False
@@ -1284,16 +3165,16 @@ if __name__ == "__main__":
         browser_arg = sys.argv[1].lower()
         if 'chrome' in browser_arg:
             BROWSER = 'chrome'
-            print("Using Chrome browser for Bing searches.")
+            log.info("Using Chrome browser for Bing searches.")
         elif 'brave' in browser_arg:
             BROWSER = 'brave'
-            print("Using Brave browser for Bing searches.")
+            log.info("Using Brave browser for Bing searches.")
         elif 'firefox' in browser_arg:
             BROWSER = 'firefox'
-            print("Using Firefox browser for Bing searches.")
+            log.info("Using Firefox browser for Bing searches.")
         elif 'edge' in browser_arg:
             BROWSER = 'edge'
-            print("Using Edge browser for searches.")
+            log.info("Using Edge browser for searches.")
         elif browser_arg in ['--help', '-h']:
             print("Usage: python search_trending_edge.py [browser] [options]")
             print("\nBrowser:")
@@ -1304,6 +3185,15 @@ if __name__ == "__main__":
             print("\nOptions:")
             print("  --headless    Run browser in headless mode (invisible)")
             print("  --existing    Connect to existing browser (requires setup)")
+            print("  --startup-bench  Report cold import time per component and exit")
+            print("  --pipeline-bench Time each topic pipeline stage and exit")
+            print("  --typing-bench   Compare per-key vs batched typing in the chosen browser and exit")
+            print("  --headed         With --typing-bench, show the browser (it runs headless by default)")
+            print("  --instrument     Trace every WebDriver command and sleep, print per-phase totals")
+            print("  --time-compression N|zero  Run all waits N times faster, or skip them (logs keep intended times)")
+            print("  --no-daemon   Launch a browser even if session_daemon.py is running")
+            print("  --log-level L  Log level: DEBUG (every step), INFO (default), WARNING or ERROR")
+            print("  --log-json    Write logs as one JSON object per line")
             print("  --help, -h    Show this help message")
             print("\nExamples:")
             print("  python search_trending_edge.py edge")
@@ -1319,14 +3209,34 @@ if __name__ == "__main__":
             print("  Then run: python search_trending_edge.py [browser] --existing")
             sys.exit(0)
     
+    if "--time-compression" in sys.argv:
+        CLOCK.set_compression(sys.argv[sys.argv.index("--time-compression") + 1])
+        log.info(f"Time compression: {CLOCK} (logged waits are intended durations)")
+
+    if "--startup-bench" in sys.argv:
+        run_startup_bench()
+        sys.exit(0)
+
+    if "--pipeline-bench" in sys.argv:
+        run_pipeline_bench()
+        sys.exit(0)
+
+    if "--typing-bench" in sys.argv:
+        run_typing_bench(BROWSER, headless="--headed" not in sys.argv)
+        sys.exit(0)
+
     # Check for command line arguments
     if "--headless" in sys.argv:
         HEADLESS = True
-        print("Running in headless mode.")
+        log.info("Running in headless mode.")
     
+    INSTRUMENT = INSTRUMENT_DEFAULT or "--instrument" in sys.argv
+    if INSTRUMENT:
+        log.info(f"Instrumentation on; traces go to {INSTRUMENT_DIR}")
+
     if "--existing" in sys.argv:
         USE_EXISTING = True
-        print(f"Attempting to use existing {BROWSER.upper()} browser.")
+        log.info(f"Attempting to use existing {BROWSER.upper()} browser.")
     
     if "--help" in sys.argv or "-h" in sys.argv:
         print("Usage: python search_trending_edge.py [browser] [options]")
@@ -1338,6 +3248,15 @@ if __name__ == "__main__":
         print("\nOptions:")
         print("  --headless    Run browser in headless mode (invisible)")
         print("  --existing    Connect to existing browser (requires setup)")
+        print("  --startup-bench  Report cold import time per component and exit")
+        print("  --pipeline-bench Time each topic pipeline stage and exit")
+        print("  --typing-bench   Compare per-key vs batched typing in the chosen browser and exit")
+        print("  --headed         With --typing-bench, show the browser (it runs headless by default)")
+        print("  --instrument     Trace every WebDriver command and sleep, print per-phase totals")
+        print("  --time-compression N|zero  Run all waits N times faster, or skip them (logs keep intended times)")
+        print("  --no-daemon   Launch a browser even if session_daemon.py is running")
+        print("  --log-level L  Log level: DEBUG (every step), INFO (default), WARNING or ERROR")
+        print("  --log-json    Write logs as one JSON object per line")
         print("  --help, -h    Show this help message")
         print("\nExamples:")
         print("  python search_trending_edge.py edge")
@@ -1353,71 +3272,40 @@ if __name__ == "__main__":
         print("  Then run: python search_trending_edge.py [browser] --existing")
         sys.exit(0)
 
-    print(f"Starting {BROWSER.upper()} search automation on Bing...")
-    print(f"Configuration: Browser={BROWSER.upper()}, Headless={HEADLESS}, Wait={MIN_WAIT}-{MAX_WAIT}s, Topics={TOPIC_COUNT}")
+    log.info(f"Starting {BROWSER.upper()} search automation on Bing...")
+    log.info(f"Configuration: Browser={BROWSER.upper()}, Headless={HEADLESS}, Wait={MIN_WAIT}-{MAX_WAIT}s, Topics={TOPIC_COUNT}")
     
-    # Try to fetch trending queries first
-    queries = fetch_trending_queries(limit=200, region='global')
+    # Trends, then generated topics, normalised, deduped and varied on demand
+    unique_searches = take_topics(topic_pipeline(trend_limit=200, region='global'), TOPIC_COUNT)
     
-    if not queries:
-        print("Couldn't fetch live trending queries; generating dynamic topics...")
-        # Generate fresh, dynamic topics every time
-        queries = generate_dynamic_topics(TOPIC_COUNT * 2)  # Generate more than needed for variety
-    else:
-        print(f"Using {len(queries)} trending queries from pytrends...")
-        # Even with trending queries, add some generated ones for variety
-        dynamic_topics = generate_dynamic_topics(TOPIC_COUNT // 2)
-        queries.extend(dynamic_topics)
-
-    # Ensure we have enough topics
-    if len(queries) < TOPIC_COUNT:
-        # Generate additional dynamic topics if needed
-        additional_topics = generate_dynamic_topics(TOPIC_COUNT - len(queries) + 10)
-        queries.extend(additional_topics)
-
-    # Remove duplicates while preserving order
-    unique_queries = []
-    seen = set()
-    for query in queries:
-        query_lower = query.lower()
-        if query_lower not in seen:
-            unique_queries.append(query)
-            seen.add(query_lower)
+    log.info(f"Starting Microsoft Rewards-optimized search sequence on {BROWSER.upper()}...")
+    log.info("Tips for maximum reward points:\n"
+             "- Make sure you're signed into your Microsoft account\n"
+             "- Don't close the browser window during searches\n"
+             "- Let the automation complete all searches\n"
+             "- Searches include engagement actions for better reward qualification")
     
-    queries = unique_queries
+    # A running session_daemon.py already has a warm browser; hand it the topics
+    if not (USE_EXISTING or INSTRUMENT or "--no-daemon" in sys.argv):
+        from session_daemon import run_search_sequence_via_daemon
+        try:
+            searches = run_search_sequence_via_daemon(unique_searches, BROWSER, MIN_WAIT, MAX_WAIT,
+                                                      headless=HEADLESS)
+        except Exception as e:
+            # Unfinished topics stay checkpointed, so the local run picks them up
+            log.warning(f"Warm {BROWSER.upper()} session failed ({e}); launching the browser here instead.")
+            searches = None
+        if searches is not None:
+            completed = sum(1 for s in searches if s['outcome'] in ('success', 'direct_url'))
+            log.info(f"Warm {BROWSER.upper()} session completed {completed}/{len(searches)} searches.")
+            sys.exit(0)
 
-    # Select random topics from the pool
-    chosen = random.sample(queries, min(TOPIC_COUNT, len(queries)))
-    
-    # Add some variation to make searches more unique (helps with rewards)
-    unique_searches = []
-    for topic in chosen:
-        # Sometimes add variations to make searches more unique
-        if random.random() < 0.3:  # 30% chance of variation
-            variations = [
-                f"{topic} 2024",
-                f"{topic} news", 
-                f"{topic} today",
-                f"{topic} latest",
-                f"best {topic}",
-                f"{topic} guide",
-                f"{topic} tips"
-            ]
-            topic = random.choice(variations)
-        unique_searches.append(topic)
-    
-    print(f"\nStarting Microsoft Rewards-optimized search sequence on {BROWSER.upper()}...")
-    print(f"Tips for maximum reward points:")
-    print("- Make sure you're signed into your Microsoft account")
-    print("- Don't close the browser window during searches") 
-    print("- Let the automation complete all searches")
-    print("- Searches include engagement actions for better reward qualification\n")
-    
     try:
-        run_search_sequence(unique_searches, browser=BROWSER, headless=HEADLESS, min_wait=MIN_WAIT, max_wait=MAX_WAIT, use_existing=USE_EXISTING)
+        run_search_sequence(unique_searches, browser=BROWSER, headless=HEADLESS, min_wait=MIN_WAIT, max_wait=MAX_WAIT, use_existing=USE_EXISTING, instrument=INSTRUMENT)
     except Exception as e:
-        print(f"\nError running search sequence: {e}")
+        log.error(f"Error running search sequence: {e}")
         if USE_EXISTING:
-            print(f"If using --existing, make sure {BROWSER.upper()} is running with remote debugging enabled.")
-        print(f"Please check that {BROWSER.upper()} is installed and the corresponding driver is available.")
+            log.error(f"If using --existing, make sure {BROWSER.upper()} is running with remote debugging enabled.")
+        log.error(f"Please check that {BROWSER.upper()} is installed and the corresponding driver is available.")
+        flush_logs()
         sys.exit(1)
@@ -0,0 +1,300 @@
+"""
+session_daemon.py
+
+Keeps one warm browser session per configured browser and runs search jobs
+sent to it over a local socket, so runs after the first skip profile sync,
+driver resolution, browser launch and the Bing warm-up (homepage load,
+account check, consent dialogs).
+
+While the daemon is running, search_trending_edge.py and
+run_all_browsers_parallel.py send their topic lists to it instead of
+launching browsers themselves (disable with --no-daemon or
+SEARCH_AUTOMATION_DAEMON=0). Browsers the daemon doesn't manage still launch
+locally.
+
+Usage:
+  python session_daemon.py                        # warm Edge, Chrome, Firefox and Brave
+  python session_daemon.py edge chrome --headless
+  python session_daemon.py --status               # show the daemon's sessions
+  python session_daemon.py --stop                 # quit its browsers and exit
+
+Protocol: one JSON object per line on 127.0.0.1:DAEMON_PORT, answered by one
+JSON line:
+  {"op": "search", "browser": "edge", "topics": [...], "min_wait": 10, "max_wait": 10}
+      -> {"status": "ok", "searches": [...]}       (run_search_sequence results)
+  {"op": "status"} -> {"status": "ok", "sessions": {"edge": {...}, ...}}
+  {"op": "stop"}   -> {"status": "ok"}
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import socketserver
+
+from search_trending_edge import log, log_context, configure_logging
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = int(os.environ.get("SEARCH_AUTOMATION_DAEMON_PORT", "47219"))
+DAEMON_ENABLED = os.environ.get("SEARCH_AUTOMATION_DAEMON", "1") != "0"
+DEFAULT_BROWSERS = ['edge', 'chrome', 'firefox', 'brave']
+DAEMON_BATCH_SIZE = 5  # queued topics sent per job, so other sessions can take the rest
+
+
+class WarmSession:
+    """One browser kept open between jobs; jobs on it run one at a time"""
+
+    def __init__(self, browser, headless=False):
+        self.browser = browser
+        self.headless = headless
+        self.driver = None
+        self.lock = threading.Lock()
+        self.launches = 0
+        self.jobs = 0
+        self.busy = False
+        self.last_error = None
+
+    def ensure_driver(self):
+        """Returns a live driver, relaunching the browser if it was closed or crashed"""
+        from search_trending_edge import build_browser_driver, warm_up_bing
+
+        if self.driver is not None:
+            try:
+                self.driver.current_url  # Test connection
+                return self.driver
+            except Exception:
+                log.warning("Session lost; relaunching...")
+                self.close()
+        started = time.time()
+        self.driver = build_browser_driver(browser=self.browser, headless=self.headless)
+        try:
+            warm_up_bing(self.driver, self.browser)  # once per session; jobs skip it
+        except Exception:
+            self.close()
+            raise
+        self.launches += 1
+        log.info(f"Warm session ready in {time.time() - started:.1f}s")
+        return self.driver
+
+    def warm_up(self):
+        log_context(browser=self.browser, session=None, search=None)
+        with self.lock:
+            try:
+                self.ensure_driver()
+            except Exception as e:
+                self.last_error = str(e)
+                log.error(f"Could not start: {e}")
+
+    def run(self, topics, min_wait, max_wait):
+        from search_trending_edge import run_search_sequence
+
+        log_context(browser=self.browser, search=None)  # runs on the request's handler thread
+        with self.lock:
+            self.busy = True
+            try:
+                driver = self.ensure_driver()
+                log.info(f"Job with {len(topics)} topics")
+                # The client owns the topic list (and any checkpoint of it)
+                searches = run_search_sequence(topics, browser=self.browser, min_wait=min_wait,
+                                               max_wait=max_wait, driver=driver, checkpoint=False,
+                                               warm_up=False)
+                self.jobs += 1
+                return searches
+            finally:
+                self.busy = False
+
+    def status(self):
+        return {'warm': self.driver is not None, 'headless': self.headless, 'busy': self.busy,
+                'launches': self.launches, 'jobs': self.jobs, 'last_error': self.last_error}
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.dispatch(request)
+        except Exception as e:
+            response = {'status': 'error', 'error': str(e), 'error_type': type(e).__name__}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+    def dispatch(self, request):
+        sessions = self.server.sessions
+        op = request.get('op')
+        if op == 'search':
+            session = sessions.get(request['browser'])
+            if session is None:
+                return {'status': 'unavailable', 'error': f"no {request['browser']} session in this daemon"}
+            searches = session.run(request['topics'], request.get('min_wait', 10), request.get('max_wait', 10))
+            return {'status': 'ok', 'searches': searches}
+        if op == 'status':
+            return {'status': 'ok', 'sessions': {name: s.status() for name, s in sessions.items()}}
+        if op == 'stop':
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {'status': 'ok'}
+        return {'status': 'error', 'error': f"unknown op {op!r}"}
+
+
+class SessionDaemon(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, browsers, headless=False, port=DAEMON_PORT):
+        super().__init__((DAEMON_HOST, port), DaemonRequestHandler)
+        self.sessions = {browser: WarmSession(browser, headless) for browser in browsers}
+
+
+def daemon_request(message, connect_timeout=0.5):
+    """Sends one request to the daemon and returns its response; raises OSError if none is running"""
+    with socket.create_connection((DAEMON_HOST, DAEMON_PORT), timeout=connect_timeout) as sock:
+        sock.settimeout(None)  # a search job takes as long as its searches
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+def run_search_sequence_via_daemon(topics, browser, min_wait=10, max_wait=10, headless=None):
+    """
+    Runs the searches on the daemon's warm session for `browser` and returns
+    the per-search results, or None when no daemon is running, it has no
+    session for that browser, or (if `headless` is given) its session's
+    headless mode differs (the caller then launches its own). `topics` may
+    be a callable or a TopicQueue, as for run_search_sequence.
+
+    The daemon's jobs don't checkpoint, so this side does: a topic list is
+    run as a TopicQueue checkpointed under the browser's name, and a run that
+    was cut short (here or in run_search_sequence) resumes from its checkpoint.
+    """
+    if not DAEMON_ENABLED:
+        return None
+    try:
+        sessions = daemon_request({'op': 'status'})['sessions']
+    except (OSError, ValueError):
+        return None
+    if browser not in sessions:
+        return None
+    if headless is not None and sessions[browser].get('headless', headless) != headless:
+        log.info(f"The daemon's {browser.upper()} session is {'not ' if headless else ''}headless; "
+                 f"launching one here instead")
+        return None
+
+    if callable(topics):
+        topics = topics()
+    if not hasattr(topics, 'claim'):
+        from search_trending_edge import TopicQueue
+
+        queue = TopicQueue.resume(browser)
+        if queue is not None:
+            log.info(f"Resuming unfinished {browser.upper()} run ({len(queue)} topics left)")
+        else:
+            queue = TopicQueue(topics, checkpoint_name=browser)
+        log.info(f"Sending {len(queue)} topics to the warm {browser.upper()} session "
+                 f"(daemon on port {DAEMON_PORT})...")
+        topics = queue
+    return _run_queue_via_daemon(topics, browser, min_wait, max_wait)
+
+
+def _run_queue_via_daemon(queue, browser, min_wait, max_wait):
+    """
+    Feeds a TopicQueue to the daemon in batches of DAEMON_BATCH_SIZE topics.
+    Topics whose search finished are completed; failed, disconnected and
+    unreached topics go back to the queue (up to MAX_SESSION_RECOVERIES
+    retries each) so another batch or session picks them up.
+
+    The searches run in the daemon's process, so this side reports each
+    batch's phase and results to its own METRICS.
+    """
+    from search_trending_edge import MAX_SESSION_RECOVERIES, METRICS
+
+    searches = []
+    retries = {}
+    while True:
+        batch = [queue.claim(browser)]
+        if batch[0] is None:
+            METRICS.set_phase(browser, 'finished')
+            return searches
+        while len(batch) < DAEMON_BATCH_SIZE:
+            topic = queue.claim(browser, wait=False)
+            if topic is None:
+                break
+            batch.append(topic)
+
+        log.info(f"Sending {len(batch)} queued topics to the warm {browser.upper()} session...")
+        METRICS.set_phase(browser, 'daemon job')
+        try:
+            response = daemon_request({'op': 'search', 'browser': browser, 'topics': batch,
+                                       'min_wait': min_wait, 'max_wait': max_wait})
+            if response['status'] != 'ok':
+                raise RuntimeError(f"Daemon job failed: {response['error']}")
+        except Exception:
+            queue.release(browser)
+            raise
+        outcomes = {s['topic']: s['outcome'] for s in response['searches']}
+        for topic in reversed(batch):  # release() pushes to the front, so keep the original order
+            outcome = outcomes.get(topic)  # None: the session stopped before reaching it
+            if outcome in ('success', 'direct_url', 'engagement_failed'):
+                queue.complete(browser, topic)
+            elif outcome is not None and retries.get(topic, 0) >= MAX_SESSION_RECOVERIES:
+                log.warning(f"Giving up on '{topic}' after {retries[topic] + 1} failed attempts")
+                queue.complete(browser, topic)
+            else:
+                if outcome is not None:
+                    retries[topic] = retries.get(topic, 0) + 1
+                queue.release(browser, topic)
+        for search in response['searches']:
+            METRICS.record_search(browser, search)
+            search['index'] = len(searches) + 1
+            searches.append(search)
+
+
+def main(argv):
+    if '--status' in argv or '--stop' in argv:
+        try:
+            response = daemon_request({'op': 'stop' if '--stop' in argv else 'status'})
+        except OSError:
+            print(f"No session daemon running on port {DAEMON_PORT}")
+            return 1
+        if '--stop' in argv:
+            print("Session daemon stopping")
+        for browser, status in response.get('sessions', {}).items():
+            print(f"  {browser:<8} warm={status['warm']} headless={status['headless']} busy={status['busy']} "
+                  f"launches={status['launches']} jobs={status['jobs']}")
+        return 0
+
+    configure_logging(argv[argv.index("--log-level") + 1] if "--log-level" in argv else None,
+                      'json' if "--log-json" in argv else None)
+    browsers = [arg for arg in argv if arg in DEFAULT_BROWSERS] or DEFAULT_BROWSERS
+    server = SessionDaemon(browsers, headless='--headless' in argv)
+    log.info(f"Session daemon on {DAEMON_HOST}:{DAEMON_PORT}; warming {', '.join(b.upper() for b in browsers)}...")
+    warmers = [threading.Thread(target=s.warm_up, name=f"{b.upper()}-Warmup") for b, s in server.sessions.items()]
+    for thread in warmers:
+        thread.start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopping session daemon...")
+    finally:
+        for thread in warmers:
+            thread.join()
+        for session in server.sessions.values():
+            with session.lock:
+                session.close()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""Behaviour of the lazy topic pipeline stages in search_trending_edge.py"""
+
+import inspect
+import itertools
+
+from search_trending_edge import (TopicSpace, _time_based_topics, normalise_topics, dedupe_topics,
+                                  vary_topics, take_topics, topic_pipeline)
+
+
+def counting_source(pulled):
+    """An endless topic source that records how far it has been read"""
+    for i in itertools.count():
+        pulled.append(i)
+        yield f"Topic {i}"
+
+
+def test_normalise_casefolds_and_collapses_whitespace():
+    topics = ["Foo  Bar", "  FOO\tBAR ", "", "   ", "Straße"]
+    assert list(normalise_topics(topics)) == ["foo bar", "foo bar", "strasse"]
+
+
+def test_dedupe_keeps_first_casefolded_match():
+    topics = ["Straße", "STRASSE", "strasse", "Baz", "baz", "Qux"]
+    assert list(dedupe_topics(topics)) == ["Straße", "Baz", "Qux"]
+
+
+def test_vary_rate_bounds():
+    assert list(vary_topics(["x", "y"], rate=0)) == ["x", "y"]
+    varied = list(vary_topics(["x"] * 50, rate=1, year=2030))
+    assert all(topic != "x" and "x" in topic for topic in varied)
+    assert all(topic == "x 2030" for topic in varied if "20" in topic)
+
+
+def test_take_caps_the_count():
+    assert take_topics(iter(["a", "b", "c"]), 2) == ["a", "b"]
+    assert take_topics(iter(["a", "b"]), 5) == ["a", "b"]  # the sources ran dry
+    assert take_topics(iter(["a"]), 0) == []
+
+    space = TopicSpace(pinned=_time_based_topics())
+    topics = take_topics(topic_pipeline(trend_limit=0, variation_rate=0, space=space), 30)
+    assert len(topics) == len(set(topics)) == 30
+
+
+def test_stages_only_pull_what_is_taken():
+    pulled = []
+    stages = vary_topics(dedupe_topics(normalise_topics(counting_source(pulled))), rate=0.5)
+    assert inspect.isgenerator(stages) and not pulled
+    assert len(take_topics(stages, 10)) == 10
+    assert len(pulled) == 10
+    assert inspect.isgenerator(topic_pipeline(trend_limit=0))